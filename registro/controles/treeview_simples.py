@@ -8,15 +8,80 @@ import logging
 import re
 import tkinter as tk
 from functools import partial
+from operator import itemgetter
 from tkinter import ttk
-from typing import Any, Dict, List, Literal, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union, cast
 
 import ttkbootstrap as ttkb
-from ttkbootstrap.constants import END, HORIZONTAL, VERTICAL, W
+from ttkbootstrap.constants import HORIZONTAL, VERTICAL, W
 from ttkbootstrap.style import Colors
 
 logger = logging.getLogger(__name__)
 
+# Insere todas as linhas, já com a tag de zebra, numa única chamada Tcl.
+_TCL_INSERIR_LINHAS = """{w linhas} {
+    set i 0
+    foreach valores $linhas {
+        $w insert {} end -values $valores -tags [expr {$i % 2 ? "oddrow" : "evenrow"}]
+        incr i
+    }
+}"""
+
+# Refaz a zebra de todas as linhas numa única chamada Tcl, mantendo as demais
+# tags de cada linha.
+_TCL_APLICAR_ZEBRA = """{w} {
+    set ordem [$w children {}]
+    if {![llength $ordem]} return
+    $w tag remove oddrow $ordem
+    $w tag remove evenrow $ordem
+    set pares {}
+    set impares {}
+    foreach {par impar} $ordem {
+        lappend pares $par
+        if {$impar ne ""} {lappend impares $impar}
+    }
+    $w tag add evenrow $pares
+    if {[llength $impares]} {$w tag add oddrow $impares}
+}"""
+
+# Retorna {iid valor iid valor ...} de uma coluna, na ordem de exibição.
+_TCL_VALORES_COLUNA = """{w coluna} {
+    set pares {}
+    foreach iid [$w children {}] {lappend pares $iid [$w set $iid $coluna]}
+    return $pares
+}"""
+
+# Move o destaque de hover para a linha sob `y` numa única chamada Tcl:
+# restaura as tags da linha anterior, guarda as da nova e retorna
+# {linha tags_originais}. Se a linha não mudou, nada é alterado.
+_TCL_ATUALIZAR_HOVER = """{w y anterior tags_anteriores} {
+    set iid [$w identify row $y]
+    if {$iid eq $anterior} {return [list $iid $tags_anteriores]}
+    if {$anterior ne "" && [$w exists $anterior]} {
+        $w item $anterior -tags $tags_anteriores
+    }
+    if {$iid eq ""} {return [list {} {}]}
+    set tags [$w item $iid -tags]
+    if {"selected" ni $tags} {$w item $iid -tags hover}
+    return [list $iid $tags]
+}"""
+
+# Aplica as diferenças calculadas por `sincronizar_linhas` numa única chamada
+# Tcl. A zebra é refeita com `tag remove`/`tag add`, que preservam as demais
+# tags das linhas (hover, selected).
+_TCL_SINCRONIZAR_LINHAS = """{w removidas novas alteradas ordem pares impares} {
+    if {[llength $removidas]} {$w delete $removidas}
+    foreach {iid valores} $novas {$w insert {} end -id $iid -values $valores}
+    foreach {iid valores} $alteradas {$w item $iid -values $valores}
+    $w children {} $ordem
+    if {[llength $ordem]} {
+        $w tag remove oddrow $ordem
+        $w tag remove evenrow $ordem
+    }
+    if {[llength $pares]} {$w tag add evenrow $pares}
+    if {[llength $impares]} {$w tag add oddrow $impares}
+}"""
+
 
 class TreeviewSimples:
     def __init__(
@@ -61,9 +126,15 @@ class TreeviewSimples:
 
         self.ids_colunas: List[str] = []
         self.mapa_texto_coluna: Dict[str, str] = {}
+        # Símbolo de coluna do Tk ("#1", "#2", ...) -> ID da coluna.
+        self._id_coluna_por_simbolo: Dict[str, str] = {}
         self._ultimo_iid_hover: Optional[str] = None
         self._ultimo_tags_hover: Union[Tuple[str, ...], Literal[""]] = ""
+        self._id_after_hover: Optional[str] = None
+        self._y_hover_pendente = 0
         self.style_config: Dict[str, str] = {}
+        # Callback opcional chamado a cada rolagem vertical com (first, last).
+        self.ao_rolar_vertical: Optional[Callable[[float, float], None]] = None
 
         # --- Criação de Widgets ---
         self.frame = ttk.Frame(
@@ -212,25 +283,44 @@ class TreeviewSimples:
                 id_col = f"{id_col}_{i}"
             self.ids_colunas.append(id_col)
             self.mapa_texto_coluna[id_col] = texto
+        self._id_coluna_por_simbolo = {
+            f"#{i}": id_col for i, id_col in enumerate(self.ids_colunas, 1)
+        }
         return self.ids_colunas
 
     def _ativar_efeito_hover(self):
         self.view.bind("<Motion>", self._ao_mover_mouse)
         self.view.bind("<Leave>", self._ao_sair_mouse)
+        self.view.bind("<Destroy>", self._cancelar_hover_pendente, add="+")
 
     def _ao_mover_mouse(self, event: tk.Event):
-        iid = self.view.identify_row(event.y)
-        if iid != self._ultimo_iid_hover:
-            if self._ultimo_iid_hover and self.view.exists(self._ultimo_iid_hover):
-                self.view.item(self._ultimo_iid_hover, tags=self._ultimo_tags_hover)
-            if iid:
-                tags_existentes = self.view.item(iid, "tags")
-                self._ultimo_tags_hover = tags_existentes
-                if "selected" not in tags_existentes:
-                    self.view.item(iid, tags=["hover"])
-            self._ultimo_iid_hover = iid
+        # Só a última posição de cada ciclo ocioso é processada.
+        self._y_hover_pendente = event.y
+        if self._id_after_hover is None:
+            self._id_after_hover = self.view.after_idle(self._processar_hover)
+
+    def _processar_hover(self):
+        self._id_after_hover = None
+        iid, tags = self.view.tk.splitlist(
+            self.view.tk.call(
+                "apply",
+                _TCL_ATUALIZAR_HOVER,
+                self.view._w,
+                self._y_hover_pendente,
+                self._ultimo_iid_hover or "",
+                self._ultimo_tags_hover,
+            )
+        )
+        self._ultimo_iid_hover = iid or None
+        self._ultimo_tags_hover = self.view.tk.splitlist(tags)
+
+    def _cancelar_hover_pendente(self, _event: Optional[tk.Event] = None):
+        if self._id_after_hover is not None:
+            self.view.after_cancel(self._id_after_hover)
+            self._id_after_hover = None
 
     def _ao_sair_mouse(self, _event: tk.Event):
+        self._cancelar_hover_pendente()
         if self._ultimo_iid_hover:
             if self.view.exists(self._ultimo_iid_hover):
                 self.view.item(self._ultimo_iid_hover, tags=self._ultimo_tags_hover)
@@ -252,14 +342,7 @@ class TreeviewSimples:
             self.view.item(iid_selecionado, tags=tags)
 
     def apply_zebra_striping(self):
-        for i, item_id in enumerate(self.view.get_children()):
-            tags = [
-                t
-                for t in self.view.item(item_id, "tags")
-                if t not in ("oddrow", "evenrow")
-            ]
-            tags.append("oddrow" if i % 2 == 1 else "evenrow")
-            self.view.item(item_id, tags=tags)
+        self.view.tk.call("apply", _TCL_APLICAR_ZEBRA, self.view._w)
 
     def _autohide_scrollbar_v(self, first, last):
         first, last = float(first), float(last)
@@ -268,6 +351,8 @@ class TreeviewSimples:
         else:
             self.sb_v.grid(row=0, column=1, sticky="ns")
         self.sb_v.set(first, last)
+        if self.ao_rolar_vertical:
+            self.ao_rolar_vertical(first, last)
 
     def _autohide_scrollbar_h(self, first, last):
         first, last = float(first), float(last)
@@ -298,21 +383,35 @@ class TreeviewSimples:
                     id_col, command=partial(self.ordenar_coluna, id_col, False)
                 )
 
+    @staticmethod
+    def _chave_ordenacao(valor: str) -> Tuple[int, float, str]:
+        """
+        Chave de ordenação de um valor de célula: números (tudo o que `float()`
+        aceita) antes de textos, e comparáveis entre si (evita o TypeError de
+        misturar float e str).
+        """
+        try:
+            return (0, float(valor), "")
+        except ValueError:
+            return (1, 0.0, valor.casefold())
+
     def ordenar_coluna(self, id_col: str, reverso: bool):
-        dados = [
-            (self.view.set(iid, id_col), iid) for iid in self.view.get_children("")
-        ]
-
-        def sort_key(item):
-            val = item[0]
-            try:
-                return float(val)
-            except (ValueError, TypeError):
-                return str(val).lower()
-
-        dados.sort(key=sort_key, reverse=reverso)
-        for i, (_, iid) in enumerate(dados):
-            self.view.move(iid, "", i)
+        # {iid valor iid valor ...} da coluna, lido numa única chamada Tcl
+        pares = self.view.tk.splitlist(
+            self.view.tk.call("apply", _TCL_VALORES_COLUNA, self.view._w, id_col)
+        )
+        # Valores repetidos na coluna (turma, prato...) são analisados uma vez
+        # por ordenação; o cache não sobrevive a ela.
+        chaves: Dict[str, Tuple[int, float, str]] = {}
+        dados = []
+        for iid, valor in zip(pares[0::2], pares[1::2]):
+            valor = str(valor)
+            chave = chaves.get(valor)
+            if chave is None:
+                chave = chaves[valor] = self._chave_ordenacao(valor)
+            dados.append((chave, iid))
+        dados.sort(key=itemgetter(0), reverse=reverso)
+        self.view.set_children("", *map(itemgetter(1), dados))
         self.apply_zebra_striping()
         self.view.heading(
             id_col, command=partial(self.ordenar_coluna, id_col, not reverso)
@@ -324,8 +423,7 @@ class TreeviewSimples:
         if self.view.identify_region(event.x, event.y) != "cell":
             return None, None
         iid = self.view.identify_row(event.y)
-        simbolo_col = self.view.identify_column(event.x)
-        id_coluna = self.id_coluna_pelo_indice(int(simbolo_col.replace("#", "")) - 1)
+        id_coluna = self._id_coluna_por_simbolo.get(self.view.identify_column(event.x))
         return iid, id_coluna
 
     def grid(self, **kwargs):
@@ -339,8 +437,48 @@ class TreeviewSimples:
 
     def construir_dados_tabela(self, dados_linhas: List[Tuple]):
         self.deletar_linhas()
-        [self.view.insert("", END, values=v) for v in dados_linhas]
-        self.apply_zebra_striping()
+        # Uma única chamada Tcl para todas as linhas, em vez de uma por linha
+        # (mais duas por linha de apply_zebra_striping).
+        if dados_linhas:
+            self.view.tk.call(
+                "apply", _TCL_INSERIR_LINHAS, self.view._w, tuple(dados_linhas)
+            )
+
+    def sincronizar_linhas(
+        self, anteriores: Dict[str, Tuple], novas: Dict[str, Tuple]
+    ) -> bool:
+        """
+        Faz a tabela, que exibe `anteriores`, passar a exibir `novas` (ambos
+        IID -> valores, na ordem de exibição): remove, insere e altera apenas as
+        linhas que mudaram, reordena e refaz a zebra. Retorna False se não havia
+        nada a mudar.
+        """
+        if novas == anteriores and list(novas) == list(anteriores):
+            return False
+
+        removidas = tuple(iid for iid in anteriores if iid not in novas)
+        inseridas: List[Any] = []
+        alteradas: List[Any] = []
+        for iid, valores in novas.items():
+            anterior = anteriores.get(iid)
+            if anterior is None:
+                inseridas += (iid, valores)
+            elif anterior != valores:
+                alteradas += (iid, valores)
+
+        ordem = tuple(novas)
+        self.view.tk.call(
+            "apply",
+            _TCL_SINCRONIZAR_LINHAS,
+            self.view._w,
+            removidas,
+            tuple(inseridas),
+            tuple(alteradas),
+            ordem,
+            ordem[0::2],
+            ordem[1::2],
+        )
+        return True
 
     def obter_iids_filhos(self) -> Tuple[str, ...]:
         return self.view.get_children()
@@ -349,21 +487,21 @@ class TreeviewSimples:
         return sel[0] if (sel := self.view.selection()) else None
 
     def obter_valores_linha(self, iid: str) -> Optional[Tuple]:
-        return (
-            tuple(self.view.set(iid).get(c, "") for c in self.ids_colunas)
-            if self.view.exists(iid)
-            else None
-        )
+        # `-values` já vem na ordem das colunas, mas cru (`item` não converte
+        # objetos Tcl). Aplica a mesma conversão que `set(iid)` usava por valor,
+        # para que os chamadores recebam os mesmos tipos (str/int), e mantém
+        # exatamente uma posição por coluna (faltantes = "").
+        try:
+            valores = tuple(map(ttk._tclobj_to_py, self.view.item(iid, "values")))
+        except tk.TclError:
+            return None
+        n = len(self.ids_colunas)
+        return valores if len(valores) == n else (valores + ("",) * n)[:n]
 
     def obter_linha_selecionada(self) -> Optional[Tuple]:
         if not (ln := self.view.selection()):
             return None
-        iid = ln[0]
-        return (
-            tuple(self.view.set(iid).get(c, "") for c in self.ids_colunas)
-            if self.view.exists(iid)
-            else None
-        )
+        return self.obter_valores_linha(ln[0])
 
     def id_coluna_pelo_indice(self, indice: int) -> Optional[str]:
         return (
@@ -8,6 +8,7 @@ import json
 import logging
 import sys
 import tkinter as tk
+from dataclasses import asdict
 from threading import Thread
 from tkinter import CENTER, TclError
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
@@ -17,7 +18,7 @@ from ttkbootstrap.constants import HORIZONTAL, LEFT, LIGHT, RIGHT, VERTICAL, X
 from ttkbootstrap.dialogs import Messagebox
 from ttkbootstrap.localization import MessageCatalog
 
-from registro.gui.constants import CAMINHO_SESSAO
+from registro.gui.constants import CAMINHO_SESSAO, DadosNovaSessao
 from registro.gui.dialogo_filtro_turmas import DialogoFiltroTurmas
 from registro.gui.dialogo_sessao import DialogoSessao
 from registro.gui.painel_acao_busca import PainelAcaoBusca
@@ -244,7 +245,7 @@ class AppRegistro(tk.Tk):
             self.after(100, self._abrir_dialogo_sessao)
 
     def tratar_resultado_dialogo_sessao(
-        self, resultado: Union[Dict, int, None]
+        self, resultado: Union[DadosNovaSessao, int, None]
     ) -> bool:
         if resultado is None:
             logger.info("Diálogo de sessão cancelado.")
@@ -268,9 +269,11 @@ class AppRegistro(tk.Tk):
                 desc_acao = f"carregar sessão ID: {id_sessao}"
                 self._fachada.definir_sessao_ativa(id_sessao)
                 sucesso = True
-            elif isinstance(resultado, dict):
-                desc_acao = f"criar nova sessão: {resultado.get('refeicao')}"
-                id_sessao = self._fachada.iniciar_nova_sessao(resultado)  # type: ignore
+            elif isinstance(resultado, DadosNovaSessao):
+                desc_acao = f"criar nova sessão: {resultado.refeicao}"
+                id_sessao = self._fachada.iniciar_nova_sessao(
+                    asdict(resultado)  # type: ignore
+                )
                 if id_sessao is None:
                     raise ErroSessao(
                         "Não é possível iniciar uma sessão de almoço"
@@ -5,8 +5,9 @@
 # Copyright (c) 2024-2025 Mateus G Pereira <mateus.pereira@ifsp.edu.br>
 
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, Set, TypedDict
+from typing import Dict, FrozenSet, List, Literal, Optional, Set
 
 DIRETORIO_APP: Path = Path(".")
 DIRETORIO_CONFIG: Path = DIRETORIO_APP / "config"
@@ -66,30 +67,34 @@ TRADUCAO_CHAVE_EXTERNA: Dict[str, str] = {
 }
 REGEX_LIMPEZA_PRONTUARIO: re.Pattern[str] = re.compile(r"^[Ii][Qq]30+")
 
-TURMAS_INTEGRADO: List[str] = [
-    "1º A - MAC",
-    "1º A - MEC",
-    "1º B - MEC",
-    "2º A - MAC",
-    "2º A - MEC",
-    "2º B - MEC",
-    "3º A - MEC",
-    "3º B - MEC",
-]
+TURMAS_INTEGRADO: FrozenSet[str] = frozenset(
+    {
+        "1º A - MAC",
+        "1º A - MEC",
+        "1º B - MEC",
+        "2º A - MAC",
+        "2º A - MEC",
+        "2º B - MEC",
+        "3º A - MEC",
+        "3º B - MEC",
+    }
+)
 NOME_LANCHE_PADRAO: str = "Lanche Padrão"
 NOME_PRATO_SEM_RESERVA: str = "Não Especificado"
 
-DadosNovaSessao = TypedDict(
-    "DadosNovaSessao",
-    {
-        "refeição": Literal["Lanche", "Almoço"],
-        "lanche": Optional[str],
-        "período": str,
-        "data": str,
-        "hora": str,
-        "groups": List[str],
-    },
-)
+
+@dataclass(slots=True, frozen=True)
+class DadosNovaSessao:
+    """Dados informados no diálogo para a criação de uma nova sessão."""
+
+    refeicao: Literal["lanche", "almoço"]
+    item_servido: Optional[str]
+    periodo: str
+    data: str
+    hora: str
+    grupos: List[str]
+
+
 SESSAO = DadosNovaSessao
 
 CSIDL_PERSONAL: int = 5
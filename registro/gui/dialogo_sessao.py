@@ -4,13 +4,18 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2024-2025 Mateus G Pereira <mateus.pereira@ifsp.edu.br>
 
+import atexit
+import bisect
 import datetime as dt
 import logging
+import os
+import queue
 import threading
 import tkinter as tk
+from functools import partial
 from pathlib import Path
 from threading import Thread
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, Union
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
 
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import EW, E, HORIZONTAL, NSEW, W, X
@@ -32,8 +37,119 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Opções de lanche compartilhadas entre instâncias do diálogo:
+# (lista ordenada e sem repetições, mtime do arquivo JSON).
+_LANCHES_CACHE: Optional[Tuple[List[str], float]] = None
+
+
+def _atualizar_cache_lanches(caminho: str, lanches: List[str]):
+    """Atualiza o cache de lanches após uma escrita, sem reler o arquivo."""
+    global _LANCHES_CACHE
+    try:
+        _LANCHES_CACHE = (list(lanches), os.stat(caminho).st_mtime)
+    except OSError:
+        _LANCHES_CACHE = None
+
+
+# Escritor único em segundo plano para o JSON de lanches. Pedidos feitos em
+# sequência rápida são agrupados e apenas o mais recente é gravado, assim que
+# nenhum outro chega por `ATRASO_ESCRITA_LANCHES` s. Falhas são entregues à
+# thread da interface por `_FALHAS_LANCHES` (ver `_monitorar_escrita_lanches`).
+ATRASO_ESCRITA_LANCHES: float = 0.2
+# (caminho, lanches) ou None para encerrar o escritor
+_FILA_LANCHES: "queue.Queue[Optional[Tuple[str, List[str]]]]" = queue.Queue()
+_FALHAS_LANCHES: "queue.Queue[str]" = queue.Queue()
+_ESCRITOR_LANCHES: Optional[Thread] = None
+
+
+def _agendar_escrita_lanches(caminho: str, lanches: List[str]):
+    global _ESCRITOR_LANCHES
+    if _ESCRITOR_LANCHES is None or not _ESCRITOR_LANCHES.is_alive():
+        _ESCRITOR_LANCHES = Thread(target=_escritor_lanches, daemon=True)
+        _ESCRITOR_LANCHES.start()
+    _FILA_LANCHES.put((caminho, lanches))
+
+
+def _escritor_lanches():
+    pendente: Optional[Tuple[str, List[str]]] = None
+    while True:
+        try:
+            pedido = _FILA_LANCHES.get(
+                timeout=ATRASO_ESCRITA_LANCHES if pendente else None
+            )
+        except queue.Empty:
+            _gravar_lanches(*pendente)
+            pendente = None
+            _FILA_LANCHES.task_done()
+            continue
+        if pedido is None:
+            if pendente is not None:
+                _gravar_lanches(*pendente)
+                _FILA_LANCHES.task_done()
+            _FILA_LANCHES.task_done()
+            return
+        if pendente is not None:
+            # Substituído por um pedido mais recente
+            _FILA_LANCHES.task_done()
+        pendente = pedido
+
+
+def _gravar_lanches(caminho: str, lanches: List[str]):
+    try:
+        sucesso = salvar_json(caminho, lanches)
+    except Exception as e:
+        logger.exception("Erro ao salvar lanches em '%s': %s", caminho, e)
+        sucesso = False
+    if sucesso:
+        _atualizar_cache_lanches(caminho, lanches)
+    else:
+        _FALHAS_LANCHES.put(caminho)
+
+
+def _monitorar_escrita_lanches(janela: tk.Misc):
+    """
+    Roda na thread da interface enquanto houver escrita pendente, exibindo as
+    falhas relatadas pelo escritor.
+    """
+    try:
+        while True:
+            caminho = _FALHAS_LANCHES.get_nowait()
+            logger.error("Falha ao salvar lanches em '%s'.", caminho)
+            Messagebox.show_error(
+                "Não foi possível salvar a nova opção de lanche.", parent=janela
+            )
+    except queue.Empty:
+        pass
+    if _FILA_LANCHES.unfinished_tasks:
+        janela.after(100, _monitorar_escrita_lanches, janela)
+
+
+@atexit.register
+def _encerrar_escritor_lanches():
+    """Grava o último pedido pendente antes de o processo terminar."""
+    escritor = _ESCRITOR_LANCHES
+    if escritor is not None and escritor.is_alive():
+        _FILA_LANCHES.put(None)
+        escritor.join(timeout=5)
+
 
 class DialogoSessao(tk.Toplevel):
+    TAMANHO_PAGINA_SESSOES: int = 50
+    # (texto, nome do método de callback, bootstyle)
+    BOTOES_TURMAS: Tuple[Tuple[str, str, str], ...] = (
+        ("⚪ Limpar", "_ao_limpar_turmas", "secondary-outline"),
+        ("🔗 Integrado", "_ao_selecionar_integral", "info-outline"),
+        ("📚 Outros", "_ao_selecionar_outros", "info-outline"),
+        ("🔄 Inverter", "_ao_inverter_turmas", "secondary-outline"),
+    )
+    # Rótulos de exibição das refeições conhecidas; outras usam `capitalizar`.
+    _REFEICAO_DISPLAY: Dict[str, str] = {
+        "lanche": "Lanche",
+        "almoço": "Almoço",
+        "almoco": "Almoço",
+        "": "",
+    }
+
     def __init__(
         self,
         title: str,
@@ -50,10 +166,22 @@ class DialogoSessao(tk.Toplevel):
         self._callback = callback
         self._parente_app = parente_app
         self._fachada: "FachadaRegistro" = parente_app.get_fachada()
-        self._dados_checkbox_turmas: List[
-            Tuple[str, tk.BooleanVar, ttk.Checkbutton]
-        ] = []
-        self._conjunto_opcoes_lanche: Set[str] = set()
+        # Turmas em arrays paralelos (nome e variável do checkbox), além das
+        # variáveis já separadas entre turmas do integrado e as demais.
+        self._turmas_nomes: List[str] = []
+        self._turmas_vars: List[tk.BooleanVar] = []
+        self._vars_integrado: List[tk.BooleanVar] = []
+        self._vars_outros: List[tk.BooleanVar] = []
+        # Lista ordenada e sem repetições: única fonte das opções de lanche.
+        self._lanches_ordenados: List[str] = []
+        # Linhas atualmente exibidas na Treeview de sessões, indexadas pelo ID.
+        self._sessoes_cache: Dict[str, Tuple] = {}
+        # Todas as sessões conhecidas; apenas as primeiras
+        # `_qtd_sessoes_exibidas` são inseridas na Treeview.
+        self._sessoes_rows: List[Tuple] = []
+        self._qtd_sessoes_exibidas: int = 0
+        self._id_after_pagina_sessoes: Optional[str] = None
+        self._construtores_abas_pendentes: Dict[str, Callable[[], None]] = {}
 
         # Atributos de widget para acesso posterior
         self._notebook: ttk.Notebook
@@ -65,9 +193,11 @@ class DialogoSessao(tk.Toplevel):
 
         self.protocol("WM_DELETE_WINDOW", self._ao_fechar)
 
+        # Fonte dos cabeçalhos registrada uma única vez como estilo nomeado.
+        ttk.Style().configure("Header.TLabel", font=("-size 12 -weight bold"))
+
         self._criar_widgets()
 
-        self.update_idletasks()
         self._centralizar_janela()
         self.resizable(True, True)
         self.deiconify()
@@ -95,11 +225,22 @@ class DialogoSessao(tk.Toplevel):
         tab_carregar.columnconfigure(0, weight=1)
         tab_carregar.rowconfigure(1, weight=1)
         self._notebook.add(tab_carregar, text="  📝 Carregar Sessão Existente  ")
-        self._criar_aba_carregar_sessao(tab_carregar)
+        # A aba de carregamento só é construída quando o usuário a seleciona.
+        self._construtores_abas_pendentes[str(tab_carregar)] = partial(
+            self._criar_aba_carregar_sessao, tab_carregar
+        )
+        self._notebook.bind("<<NotebookTabChanged>>", self._ao_mudar_aba)
 
         botoes_frame = self._criar_secao_botoes_principais(main_frame)
         botoes_frame.grid(row=1, column=0, sticky=EW, pady=(15, 0))
 
+    def _ao_mudar_aba(self, _=None):
+        construtor = self._construtores_abas_pendentes.pop(
+            self._notebook.select(), None
+        )
+        if construtor:
+            construtor()
+
     def _criar_aba_nova_sessao(self, parent: ttk.Frame):
         """Popula a aba de criação de nova sessão."""
         frame_detalhes = self._criar_secao_nova_sessao(parent)
@@ -113,15 +254,15 @@ class DialogoSessao(tk.Toplevel):
         ttk.Label(
             frame_turmas,
             text="🎟️ Selecione Turmas Participantes",
-            font=("-size 12 -weight bold"),
+            style="Header.TLabel",
         ).grid(row=0, column=0, sticky=W, pady=(0, 5))
         ttk.Separator(frame_turmas, orient=HORIZONTAL).grid(
             row=1, column=0, sticky=EW, pady=(0, 15)
         )
 
         turmas_disponiveis = self._buscar_turmas_disponiveis()
-        self._dados_checkbox_turmas, frame_checkboxes = (
-            self._criar_secao_checkbox_turmas(frame_turmas, turmas_disponiveis)
+        frame_checkboxes = self._criar_secao_checkbox_turmas(
+            frame_turmas, turmas_disponiveis
         )
         frame_checkboxes.grid(row=2, column=0, sticky=NSEW)
 
@@ -131,20 +272,36 @@ class DialogoSessao(tk.Toplevel):
     def _criar_aba_carregar_sessao(self, parent: ttk.Frame):
         """Popula a aba de carregamento com uma Treeview de sessões."""
         ttk.Label(
-            parent, text="Selecione uma Sessão Anterior", font=("-size 12 -weight bold")
+            parent, text="Selecione uma Sessão Anterior", style="Header.TLabel"
         ).grid(row=0, column=0, sticky=W, pady=(0, 5))
         ttk.Separator(parent, orient=HORIZONTAL).grid(
             row=1, column=0, sticky=EW, pady=(0, 15)
         )
 
-        sessoes_data = self._carregar_sessoes_existentes()
+        label_carregando = ttk.Label(
+            parent, text="Carregando sessões...", anchor="center"
+        )
+        label_carregando.grid(row=1, column=0, sticky=NSEW, pady=20)
+
+        # A consulta roda na thread da interface (a sessão SQLAlchemy da
+        # fachada não pode ser usada por outra thread), mas só depois que a
+        # aba e o aviso de carregamento forem desenhados.
+        self.after_idle(self._carregar_aba_sessoes, parent, label_carregando)
 
+    def _carregar_aba_sessoes(self, parent: ttk.Frame, label_carregando: ttk.Label):
+        if not self.winfo_exists():
+            return
+
+        sessoes_data = self._carregar_sessoes_existentes()
         if not sessoes_data:
-            ttk.Label(
-                parent, text="Nenhuma sessão anterior encontrada.", anchor="center"
-            ).grid(row=1, column=0, sticky=NSEW, pady=20)
+            label_carregando.config(text="Nenhuma sessão anterior encontrada.")
             return
 
+        label_carregando.destroy()
+        self._criar_treeview_sessoes(parent, sessoes_data)
+
+    def _criar_treeview_sessoes(self, parent: ttk.Frame, sessoes_data: List[Tuple]):
+
         cols = [
             {"text": "ID", "stretch": False, "width": 50},
             {"text": "Data", "stretch": False, "width": 100},
@@ -168,22 +325,25 @@ class DialogoSessao(tk.Toplevel):
             ),
         )
         self._treeview_sessoes.grid(row=1, column=0, sticky=NSEW)
-        self._treeview_sessoes.construir_dados_tabela(sessoes_data)
+        self._treeview_sessoes.ao_rolar_vertical = self._ao_rolar_sessoes
+        self._aplicar_sessoes_na_treeview(sessoes_data)
 
     def _criar_secao_nova_sessao(self, parent: tk.Widget) -> ttk.Frame:
         frame = ttk.Frame(parent)
         frame.columnconfigure((1, 3), weight=1)
 
         ttk.Label(
-            frame, text="Detalhes da Sessão", font=("-size 12 -weight bold")
+            frame, text="Detalhes da Sessão", style="Header.TLabel"
         ).grid(row=0, column=0, columnspan=4, sticky=W, pady=(0, 5))
         ttk.Separator(frame, orient=HORIZONTAL).grid(
             row=1, column=0, columnspan=4, sticky=EW, pady=(0, 15)
         )
 
+        agora = dt.datetime.now()
+
         ttk.Label(frame, text="Horário:").grid(row=2, column=0, sticky=W, padx=(0, 5))
         self._entrada_hora = ttk.Entry(frame, width=10)
-        self._entrada_hora.insert(0, dt.datetime.now().strftime("%H:%M"))
+        self._entrada_hora.insert(0, agora.strftime("%H:%M"))
         self._entrada_hora.grid(row=2, column=1, sticky=EW, pady=(0, 8))
 
         ttk.Label(frame, text="Data:").grid(row=2, column=2, sticky=W, padx=(15, 5))
@@ -193,8 +353,8 @@ class DialogoSessao(tk.Toplevel):
         self._entrada_data.grid(row=2, column=3, sticky=EW, pady=(0, 8))
 
         ttk.Label(frame, text="Refeição:").grid(row=3, column=0, sticky=W, padx=(0, 5))
-        hora_agora = dt.datetime.now().time()
-        eh_hora_almoco = dt.time(11, 00) <= hora_agora <= dt.time(13, 30)
+        minutos_agora = agora.hour * 60 + agora.minute
+        eh_hora_almoco = 660 <= minutos_agora <= 810  # 11:00 às 13:30
         self._combobox_refeicao = ttk.Combobox(
             frame, values=["Lanche", "Almoço"], state="readonly"
         )
@@ -209,7 +369,9 @@ class DialogoSessao(tk.Toplevel):
         ttk.Label(frame, text="Item Servido:").grid(
             row=4, column=0, sticky=W, padx=(0, 5)
         )
-        self._conjunto_opcoes_lanche, lista_exibicao_lanches = (
+        # Em caso de erro a lista exibida contém apenas a mensagem, que não
+        # deve ser tratada como opção.
+        self._lanches_ordenados, lista_exibicao_lanches = (
             self._carregar_opcoes_lanche()
         )
         self._combobox_lanche = ttk.Combobox(
@@ -224,7 +386,7 @@ class DialogoSessao(tk.Toplevel):
 
     def _criar_secao_checkbox_turmas(
         self, master: tk.Widget, turmas: List[str]
-    ) -> Tuple[List[Tuple[str, tk.BooleanVar, ttk.Checkbutton]], ScrolledFrame]:
+    ) -> ScrolledFrame:
         container = ScrolledFrame(
             master,
             autohide=True,
@@ -233,11 +395,12 @@ class DialogoSessao(tk.Toplevel):
             height=100,
             width=500,
         )
-        dados_checkbox = []
+        self._turmas_nomes, self._turmas_vars = [], []
+        self._vars_integrado, self._vars_outros = [], []
 
         if not turmas:
             ttk.Label(container, text="Nenhuma turma disponível.").pack(pady=10)
-            return [], container
+            return container
 
         num_cols = 3
         container.columnconfigure(list(range(num_cols)), weight=1)
@@ -256,25 +419,26 @@ class DialogoSessao(tk.Toplevel):
                 padx=10,
                 pady=4,
             )
-            dados_checkbox.append((nome_turma, var, cb))
+            self._turmas_nomes.append(nome_turma)
+            self._turmas_vars.append(var)
+            if nome_turma in TURMAS_INTEGRADO:
+                self._vars_integrado.append(var)
+            else:
+                self._vars_outros.append(var)
 
-        return dados_checkbox, container
+        return container
 
     def _criar_secao_botoes_turmas(self, parent: tk.Widget) -> ttk.Frame:
         frame_botoes = ttk.Frame(parent)
         frame_botoes.columnconfigure(tuple(range(4)), weight=1)
 
-        botoes = [
-            ("⚪ Limpar", self._ao_limpar_turmas, "secondary-outline"),
-            ("🔗 Integrado", self._ao_selecionar_integral, "info-outline"),
-            ("📚 Outros", self._ao_selecionar_outros, "info-outline"),
-            ("🔄 Inverter", self._ao_inverter_turmas, "secondary-outline"),
-        ]
-
-        for i, (texto, cmd, estilo) in enumerate(botoes):
-            ttk.Button(frame_botoes, text=texto, command=cmd, bootstyle=estilo).grid(
-                row=0, column=i, sticky=EW, padx=2
-            )
+        for i, (texto, metodo, estilo) in enumerate(self.BOTOES_TURMAS):
+            ttk.Button(
+                frame_botoes,
+                text=texto,
+                command=getattr(self, metodo),
+                bootstyle=estilo,
+            ).grid(row=0, column=i, sticky=EW, padx=2)
         return frame_botoes
 
     def _criar_secao_botoes_principais(self, parent: tk.Widget) -> ttk.Frame:
@@ -330,13 +494,16 @@ class DialogoSessao(tk.Toplevel):
             if not self._validar_entrada_nova_sessao():
                 return
 
-            turmas = [txt for txt, var, _ in self._dados_checkbox_turmas if var.get()]
+            turmas = [
+                nome
+                for nome, var in zip(self._turmas_nomes, self._turmas_vars)
+                if var.get()
+            ]
             refeicao = self._combobox_refeicao.get().lower()
             item = self._combobox_lanche.get().strip() if refeicao == "lanche" else None
 
-            if item:
-                self._salvar_nova_opcao_lanche(item)
-                item = self._combobox_lanche.get().strip()
+            if item and not self._contem_lanche(item):
+                item = self._salvar_nova_opcao_lanche(item)
 
             try:
                 data_ui = self._entrada_data.entry.get()
@@ -348,14 +515,14 @@ class DialogoSessao(tk.Toplevel):
                 Messagebox.show_error("Erro Interno", "Data inválida.", parent=self)
                 return
 
-            dados_nova_sessao: Dict[str, Union[str, List[str], None]] = {
-                "refeicao": refeicao,
-                "item_servido": item,
-                "periodo": "Integral",
-                "data": data_backend,
-                "hora": self._entrada_hora.get(),
-                "grupos": turmas,
-            }
+            dados_nova_sessao = DadosNovaSessao(
+                refeicao=refeicao,  # type: ignore
+                item_servido=item,
+                periodo="Integral",
+                data=data_backend,
+                hora=self._entrada_hora.get(),
+                grupos=turmas,
+            )
 
             logger.info("Tentando criar uma nova sessão.")
             if self._callback(dados_nova_sessao):
@@ -365,23 +532,22 @@ class DialogoSessao(tk.Toplevel):
     def _buscar_turmas_disponiveis(self) -> List[str]:
         try:
             grupos = self._fachada.listar_todos_os_grupos()
-            return sorted(g.get("nome", "") for g in grupos if g.get("nome"))
+            return sorted(filter(None, (g.get("nome") for g in grupos)))
         except Exception as e:
             logger.exception("Erro ao buscar turmas: %s", e)
             Messagebox.show_error("Não foi possível buscar as turmas.", parent=self)
             return []
 
     def _centralizar_janela(self):
-        self.update_idletasks()
+        # O tamanho requisitado já reflete o layout quando ele foi calculado;
+        # só força um passo de layout se a janela ainda não foi medida.
+        largura, altura = self.winfo_reqwidth(), self.winfo_reqheight()
+        if largura <= 1 or altura <= 1:
+            self.update_idletasks()
+            largura, altura = self.winfo_reqwidth(), self.winfo_reqheight()
         parente = self._parente_app
-        pos_x = (
-            parente.winfo_x() + (parente.winfo_width() // 2) - (self.winfo_width() // 2)
-        )
-        pos_y = (
-            parente.winfo_y()
-            + (parente.winfo_height() // 2)
-            - (self.winfo_height() // 2)
-        )
+        pos_x = parente.winfo_x() + (parente.winfo_width() // 2) - (largura // 2)
+        pos_y = parente.winfo_y() + (parente.winfo_height() // 2) - (altura // 2)
         self.geometry(f"+{pos_x}+{pos_y}")
 
     def _ao_fechar(self):
@@ -392,18 +558,30 @@ class DialogoSessao(tk.Toplevel):
         except Exception as e:
             logger.exception("Erro no callback de fechamento: %s", e)
 
-    def _carregar_opcoes_lanche(self) -> Tuple[Set[str], List[str]]:
+    def _carregar_opcoes_lanche(self) -> Tuple[List[str], List[str]]:
+        """Retorna as opções de lanche ordenadas e a lista a ser exibida."""
+        global _LANCHES_CACHE
         caminho = Path(CAMINHO_JSON_LANCHES)
         padrao = [NOME_LANCHE_PADRAO]
+
+        try:
+            mtime: Optional[float] = os.stat(caminho).st_mtime
+        except OSError:
+            mtime = None
+        if _LANCHES_CACHE is not None and _LANCHES_CACHE[1] == mtime:
+            lista = _LANCHES_CACHE[0]
+            return list(lista), list(lista)
+
         try:
             opcoes = carregar_json(str(caminho))
             if not isinstance(opcoes, list) or not all(
                 isinstance(s, str) for s in opcoes
             ):
                 raise TypeError("Conteúdo do JSON de lanches é inválido.")
-            return set(opcoes) if opcoes else set(padrao), (
-                sorted(opcoes) if opcoes else padrao
-            )
+            lista = sorted(set(opcoes)) if opcoes else padrao
+            if mtime is not None:
+                _LANCHES_CACHE = (lista, mtime)
+            return list(lista), list(lista)
         except (FileNotFoundError, TypeError) as e:
             logger.warning(
                 "Arquivo de lanches não encontrado ou inválido ('%s'): %s. Usando padrão.",
@@ -411,35 +589,24 @@ class DialogoSessao(tk.Toplevel):
                 e,
             )
             salvar_json(str(caminho), padrao)
-            return set(padrao), padrao
+            return list(padrao), padrao
         except Exception as e:
             logger.exception("Erro ao carregar lanches de '%s': %s", caminho, e)
-            return set(), [f"Erro ao carregar {caminho.name}"]
+            return [], [f"Erro ao carregar {caminho.name}"]
 
     def _carregar_sessoes_existentes(self) -> List[Tuple]:
         try:
+            # A fachada já retorna as sessões da mais recente para a mais antiga.
             sessoes = self._fachada.listar_todas_sessoes()
-
-            def sort_key(s):
-                try:
-                    # O formato no banco é 'DD/MM/YYYY', precisa converter para ordenar
-                    return dt.datetime.strptime(
-                        s.get("data", "01/01/1900") + " " + s.get("hora", "00:00"),
-                        "%d/%m/%Y %H:%M",
-                    )
-                except ValueError:
-                    return dt.datetime.min  # Põe datas mal formatadas no final
-
-            dados_tabela = []
-            for s in sorted(sessoes, key=sort_key, reverse=True):
-                linha = (
-                    s.get("id"),
-                    s.get("data"),
-                    s.get("hora"),
-                    capitalizar(s.get("refeicao", "")),
-                )
-                dados_tabela.append(linha)
-            return dados_tabela
+            exibicao = self._REFEICAO_DISPLAY
+            linhas = []
+            for s in sessoes:
+                refeicao = s.get("refeicao", "")
+                rotulo = exibicao.get(refeicao)
+                if rotulo is None:
+                    rotulo = capitalizar(refeicao)
+                linhas.append((s.get("id"), s.get("data"), s.get("hora"), rotulo))
+            return linhas
         except Exception as e:
             logger.exception("Erro ao buscar sessões: %s", e)
             # Retorna lista vazia em caso de erro, a UI mostrará a mensagem
@@ -450,26 +617,39 @@ class DialogoSessao(tk.Toplevel):
         self._combobox_lanche.config(state="disabled" if eh_almoco else "normal")
         if eh_almoco:
             self._combobox_lanche.set("")
-        elif NOME_LANCHE_PADRAO in self._conjunto_opcoes_lanche:
+        elif self._contem_lanche(NOME_LANCHE_PADRAO):
             self._combobox_lanche.set(NOME_LANCHE_PADRAO)
 
     def _ao_limpar_turmas(self):
-        self._definir_checkboxes_turmas(lambda n, v: False)
+        self._definir_checkboxes_turmas([False] * len(self._turmas_vars))
 
     def _ao_selecionar_integral(self):
-        self._definir_checkboxes_turmas(lambda n, v: n in TURMAS_INTEGRADO)
+        self._atribuir_vars_turmas(
+            [(var, True) for var in self._vars_integrado]
+            + [(var, False) for var in self._vars_outros]
+        )
 
     def _ao_selecionar_outros(self):
-        self._definir_checkboxes_turmas(lambda n, v: n not in TURMAS_INTEGRADO)
+        self._atribuir_vars_turmas(
+            [(var, False) for var in self._vars_integrado]
+            + [(var, True) for var in self._vars_outros]
+        )
 
     def _ao_inverter_turmas(self):
-        self._definir_checkboxes_turmas(lambda n, v: not v.get())
+        self._definir_checkboxes_turmas([not v.get() for v in self._turmas_vars])
 
-    def _definir_checkboxes_turmas(
-        self, condicao: Callable[[str, tk.BooleanVar], bool]
-    ):
-        for nome, var, _ in self._dados_checkbox_turmas:
-            var.set(condicao(nome, var))
+    def _definir_checkboxes_turmas(self, valores: List[bool]):
+        self._atribuir_vars_turmas(list(zip(self._turmas_vars, valores)))
+
+    def _atribuir_vars_turmas(self, pares: List[Tuple[tk.BooleanVar, bool]]):
+        """Atribui todas as variáveis dos checkboxes em um único script Tcl."""
+        if not pares:
+            return
+        script = "\n".join(
+            f"set {{{var._name}}} {int(valor)}"  # pylint: disable=protected-access
+            for var, valor in pares
+        )
+        self.tk.eval(script)
 
     def _validar_entrada_nova_sessao(self) -> bool:
         try:
@@ -480,7 +660,7 @@ class DialogoSessao(tk.Toplevel):
         if not self._entrada_data.entry.get():
             Messagebox.show_warning("Data é obrigatória.", parent=self)
             return False
-        if not any(v.get() for n, v, c in self._dados_checkbox_turmas):
+        if not any(v.get() for v in self._turmas_vars):
             Messagebox.show_warning("Selecione pelo menos uma turma.", parent=self)
             return False
         if (
@@ -493,27 +673,37 @@ class DialogoSessao(tk.Toplevel):
             return False
         return True
 
-    def _salvar_nova_opcao_lanche(self, selecao: str):
+    def _contem_lanche(self, nome: str) -> bool:
+        lanches = self._lanches_ordenados
+        i = bisect.bisect_left(lanches, nome)
+        return i < len(lanches) and lanches[i] == nome
+
+    def _salvar_nova_opcao_lanche(self, selecao: str) -> str:
+        """Salva `selecao` como nova opção e devolve o nome como ficou salvo.
+
+        Seleções recusadas (vazias ou de erro) voltam sem alteração.
+        """
         if (
             selecao
-            and selecao not in self._conjunto_opcoes_lanche
+            and not self._contem_lanche(selecao)
             and "Erro" not in selecao
         ):
             normalizado = capitalizar(selecao)
-            self._conjunto_opcoes_lanche.add(normalizado)
-            caminho = Path(CAMINHO_JSON_LANCHES)
-            try:
-                if salvar_json(
-                    str(caminho), sorted(list(self._conjunto_opcoes_lanche))
-                ):
-                    self._combobox_lanche["values"] = sorted(
-                        list(self._conjunto_opcoes_lanche)
-                    )
-                    self._combobox_lanche.set(normalizado)
-            except Exception:
-                Messagebox.show_error(
-                    "Não foi possível salvar a nova opção de lanche.", parent=self
-                )
+            if self._contem_lanche(normalizado):
+                self._combobox_lanche.set(normalizado)
+                return normalizado
+            bisect.insort(self._lanches_ordenados, normalizado)
+            lanches_ordenados = list(self._lanches_ordenados)
+            self._combobox_lanche["values"] = lanches_ordenados
+            self._combobox_lanche.set(normalizado)
+
+            # A escrita em disco não precisa bloquear o fechamento do diálogo;
+            # eventuais falhas são exibidas sobre a janela principal, que
+            # continua existindo depois dele.
+            _agendar_escrita_lanches(str(Path(CAMINHO_JSON_LANCHES)), lanches_ordenados)
+            _monitorar_escrita_lanches(self._parente_app)
+            return normalizado
+        return selecao
 
     def _ao_sincronizar_reservas(self):
         self._parente_app.mostrar_barra_progresso(True, "Sincronizando reservas...")
@@ -525,19 +715,22 @@ class DialogoSessao(tk.Toplevel):
 
     def _acao_sincronizacao(self):
         thread = threading.current_thread()
-        thread.error = None
+        thread.erro = None
         try:
             self._fachada.sincronizar_do_google_sheets()
         except Exception as e:
-            thread.error = e
+            thread.erro = e
 
     def _monitorar_sincronizacao(self, thread: Thread):
+        # O Tk só pode ser usado pela thread da interface: ela verifica
+        # periodicamente se a sincronização terminou.
         if thread.is_alive():
-            self.after(150, lambda: self._monitorar_sincronizacao(thread))
+            self.after(150, self._monitorar_sincronizacao, thread)
             return
+        self._finalizar_sincronizacao(getattr(thread, "erro", None))
 
+    def _finalizar_sincronizacao(self, erro: Optional[Exception]):
         self._parente_app.mostrar_barra_progresso(False)
-        erro = getattr(thread, "error", None)
         if erro:
             Messagebox.show_error(
                 f"Falha ao sincronizar reservas:\n{erro}", parent=self
@@ -550,5 +743,43 @@ class DialogoSessao(tk.Toplevel):
         if not self._treeview_sessoes:
             return
 
-        novos_dados = self._carregar_sessoes_existentes()
-        self._treeview_sessoes.construir_dados_tabela(novos_dados)
+        self._aplicar_sessoes_na_treeview(self._carregar_sessoes_existentes())
+
+    def _aplicar_sessoes_na_treeview(self, linhas: List[Tuple]):
+        """
+        Guarda a lista completa de sessões e exibe apenas as páginas já
+        carregadas; as demais são inseridas conforme o usuário rola a tabela.
+        """
+        self._sessoes_rows = linhas
+        self._qtd_sessoes_exibidas = max(
+            self._qtd_sessoes_exibidas, self.TAMANHO_PAGINA_SESSOES
+        )
+        self._sincronizar_pagina_sessoes()
+
+    def _ao_rolar_sessoes(self, _first: float, last: float):
+        if (
+            last > 0.9
+            and self._id_after_pagina_sessoes is None
+            and self._qtd_sessoes_exibidas < len(self._sessoes_rows)
+        ):
+            self._id_after_pagina_sessoes = self.after_idle(
+                self._carregar_proxima_pagina_sessoes
+            )
+
+    def _carregar_proxima_pagina_sessoes(self):
+        self._id_after_pagina_sessoes = None
+        self._qtd_sessoes_exibidas += self.TAMANHO_PAGINA_SESSOES
+        self._sincronizar_pagina_sessoes()
+
+    def _sincronizar_pagina_sessoes(self):
+        """
+        Atualiza a Treeview de sessões alterando apenas as linhas que mudaram
+        em relação ao cache, em vez de reconstruir a tabela inteira.
+        """
+        if not self._treeview_sessoes:
+            return
+
+        linhas = self._sessoes_rows[: self._qtd_sessoes_exibidas]
+        novas = {str(linha[0]): linha for linha in linhas}
+        if self._treeview_sessoes.sincronizar_linhas(self._sessoes_cache, novas):
+            self._sessoes_cache = novas
@@ -4,21 +4,26 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2024-2025 Mateus G Pereira <mateus.pereira@ifsp.edu.br>
 
+import bisect
+import heapq
 import logging
 import re
+import time
 import tkinter as tk
-from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import ttkbootstrap as ttk
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
 from ttkbootstrap.constants import (DANGER, DEFAULT, DISABLED, INFO, LEFT,
                                     NORMAL, SUCCESS, WARNING, W, X)
 from ttkbootstrap.dialogs import Messagebox
 
 from registro.controles.treeview_simples import TreeviewSimples
 from registro.gui.constants import REGEX_LIMPEZA_PRONTUARIO
-from registro.nucleo.exceptions import ErroSessaoNaoAtiva
+from registro.nucleo.exceptions import ErroEstudanteJaConsumiu, ErroSessaoNaoAtiva
 from registro.nucleo.facade import FachadaRegistro
 
 if TYPE_CHECKING:
@@ -27,6 +32,39 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class EstudanteElegivel:
+    """Estudante elegível com as chaves de busca e a linha da tabela prontas."""
+
+    pront: str
+    nome: str
+    turma: Optional[str]
+    prato: Optional[str]
+    nome_lower: str
+    pront_limpo: str
+    linha: Tuple[str, str, str, str]
+
+
+@dataclass(slots=True, frozen=True)
+class IndiceElegiveis:
+    """
+    Lista de elegíveis e estruturas auxiliares de busca, alinhadas por posição.
+    Imutável, para poder ser lida pela thread de busca sem sincronização.
+    """
+
+    estudantes: List[EstudanteElegivel]
+    nomes: List[str]
+    pronts: List[str]
+    bigramas: Dict[str, List[int]]
+    pront_exato: Dict[str, int]
+    # (prontuário limpo, posição), ordenado: índice de prefixos via bisect
+    pronts_ordenados: List[Tuple[str, int]]
+
+
+# Termos que parecem um prontuário (prefixo opcional de duas letras + dígitos/x).
+_RE_DETECTA_PRONT = re.compile(r"(?:[a-z]{2})?[\dx\s]+", re.IGNORECASE)
+
+
 class PainelAcaoBusca(ttk.Frame):
     """
     Painel da interface gráfica para busca e registro de consumo dos estudantes.
@@ -35,8 +73,11 @@ class PainelAcaoBusca(ttk.Frame):
     elegíveis, uma área de pré-visualização do estudante selecionado e botões
     para registrar o consumo.
     """
-    TERMOS_BUSCA_TODOS: List[str] = ["todos", "---", "***", ".."]
-    ATRASO_DEBOUNCE_BUSCA: int = 100
+    TERMOS_BUSCA_TODOS: FrozenSet[str] = frozenset({"todos", "---", "***", ".."})
+    ATRASO_DEBOUNCE_BUSCA: int = 50
+    INTERVALO_VERIFICACAO_BUSCA: int = 10
+    LIMITE_RESULTADOS_BUSCA: int = 50
+    TAMANHO_CACHE_RESULTADOS: int = 64
 
     def __init__(
         self,
@@ -50,8 +91,41 @@ class PainelAcaoBusca(ttk.Frame):
 
         # Atributos de estado
         self._id_after_busca: Optional[str] = None
-        self._dados_correspondencias_elegiveis_atuais: List[Dict[str, Any]] = []
-        self._dados_elegivel_selecionado: Optional[Dict[str, Any]] = None
+        self._dados_correspondencias_elegiveis_atuais: List[EstudanteElegivel] = []
+        # IID da linha na tabela (o prontuário) -> dados do estudante exibido
+        self._mapa_iid_para_estudante: Dict[str, EstudanteElegivel] = {}
+        # (chave de versão, elegíveis) da última consulta à fachada
+        self._cache_elegiveis: Optional[Tuple[Tuple, IndiceElegiveis]] = None
+        # Linhas atualmente exibidas na tabela, na ordem de exibição
+        self._linhas_elegiveis_exibidas: Dict[str, Tuple[str, ...]] = {}
+        # IIDs exibidos, em ordem, e a posição de cada um, para a navegação por
+        # setas; válidos enquanto as linhas exibidas forem `_ordem_exibida_de`.
+        self._ordem_exibida: Tuple[str, ...] = ()
+        self._posicoes_exibidas: Dict[str, int] = {}
+        self._ordem_exibida_de: Optional[Dict[str, Tuple[str, ...]]] = None
+        self._dados_elegivel_selecionado: Optional[EstudanteElegivel] = None
+        # (pront, nome) -> (nome em minúsculas, prontuário limpo)
+        self._cache_chaves_busca: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # A pontuação roda fora da thread da interface, que acompanha o
+        # `Future` com `after` (ver `_monitorar_busca`); resultados de buscas
+        # anteriores à última (`_seq_busca`) são descartados.
+        self._executor_busca = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="busca_elegiveis"
+        )
+        self._seq_busca: int = 0
+        self._id_after_resultado_busca: Optional[str] = None
+        # (termo, elegíveis) da busca mais recente; ao ser aplicada, seu resultado
+        # entra em `_resultados_busca` (LRU por termo), válido enquanto a lista
+        # de elegíveis for `_resultados_busca_de`.
+        self._busca_pendente: Optional[Tuple[str, IndiceElegiveis]] = None
+        self._resultados_busca: "OrderedDict[str, List[EstudanteElegivel]]" = (
+            OrderedDict()
+        )
+        self._resultados_busca_de: Optional[IndiceElegiveis] = None
+        # Enter pressionado antes de a busca do termo atual terminar: o registro
+        # é feito quando os resultados dela forem exibidos.
+        self._busca_em_andamento: bool = False
+        self._registrar_apos_busca: bool = False
 
         # Atributos de widgets da interface
         self._var_entrada_busca: tk.StringVar = tk.StringVar()
@@ -61,6 +135,9 @@ class PainelAcaoBusca(ttk.Frame):
         self._label_aluno_selecionado: Optional[ttk.Label] = None
         self._botao_registrar: Optional[ttk.Button] = None
         self._label_feedback_acao: Optional[ttk.Label] = None
+        # Últimos estados aplicados aos widgets (ver `_aplicar_estado_ui`)
+        self._estados_ui: Dict[str, str] = {}
+        self._preview_aplicado: Optional[Tuple[str, str]] = None
 
         self.grupos_excluidos: List[str] = []
         self.grupos_selecionados: List[str] = []
@@ -161,13 +238,15 @@ class PainelAcaoBusca(ttk.Frame):
 
     def _configurar_vinculos_eventos(self):
         """Configura os bindings de eventos para os widgets."""
+        # O trace cobre qualquer edição do texto: digitação, colar (teclado,
+        # menu ou botão do meio), recortar e arrastar.
         self._var_entrada_busca.trace_add("write", self._na_mudanca_entrada_busca)
 
         if self._entrada_busca:
-            self._entrada_busca.bind("<Return>", lambda _: self._registrar_elegivel_selecionado())
+            self._entrada_busca.bind("<Return>", self._ao_confirmar_busca)
             self._entrada_busca.bind("<Down>", lambda _: self._selecionar_proximo_elegivel(1))
             self._entrada_busca.bind("<Up>", lambda _: self._selecionar_proximo_elegivel(-1))
-            self._entrada_busca.bind("<Escape>", lambda _: self._var_entrada_busca.set(""))
+            self._entrada_busca.bind("<Escape>", self.limpar_busca)
 
         if self._tree_estudantes_elegiveis:
             self._tree_estudantes_elegiveis.view.bind(
@@ -183,30 +262,26 @@ class PainelAcaoBusca(ttk.Frame):
 
     def habilitar_controles(self):
         """Habilita os controles do painel para interação."""
-        if self._entrada_busca:
-            self._entrada_busca.config(state=NORMAL)
-        if self._botao_limpar:
-            self._botao_limpar.config(state=NORMAL)
-        if self._botao_registrar:
-            self._botao_registrar.config(state=DISABLED)
+        self._invalidar_cache_elegiveis()
+        self._aplicar_estado_ui(
+            entrada=NORMAL, limpar=NORMAL, registrar=DISABLED, preview=False
+        )
         logger.debug("Controles do painel de ação habilitados.")
         self.focar_entrada()
 
     def desabilitar_controles(self):
         """Desabilita os controles do painel."""
-        if self._entrada_busca:
-            self._entrada_busca.config(state=DISABLED)
-            self._var_entrada_busca.set("")
-        if self._botao_limpar:
-            self._botao_limpar.config(state=DISABLED)
-        if self._botao_registrar:
-            self._botao_registrar.config(state=DISABLED)
+        self._var_entrada_busca.set("")
         if self._tree_estudantes_elegiveis:
             self._tree_estudantes_elegiveis.deletar_linhas()
+            self._linhas_elegiveis_exibidas = {}
 
         self._dados_elegivel_selecionado = None
         self._dados_correspondencias_elegiveis_atuais = []
-        self._atualizar_label_preview()
+        self._mapa_iid_para_estudante = {}
+        self._cache_chaves_busca.clear()
+        self._invalidar_cache_elegiveis()
+        self._aplicar_estado_ui(entrada=DISABLED, limpar=DISABLED, registrar=DISABLED)
         logger.debug("Controles do painel de ação desabilitados.")
 
     def focar_entrada(self):
@@ -227,13 +302,25 @@ class PainelAcaoBusca(ttk.Frame):
             logger.warning("Tentativa de limpar busca com campo não inicializado.")
 
     def atualizar_resultados(self):
-        """Força a atualização dos resultados da busca."""
+        """
+        Força a atualização dos resultados da busca, descartando a lista de
+        elegíveis em cache (ex.: após mudanças feitas fora deste painel).
+        """
         logger.debug("Atualizando resultados da busca.")
+        self._invalidar_cache_elegiveis()
         if self._id_after_busca is not None:
             self.after_cancel(self._id_after_busca)
             self._id_after_busca = None
         self._executar_busca_real()
 
+    def destroy(self):
+        """Encerra o executor de buscas antes de destruir o painel."""
+        if self._id_after_resultado_busca is not None:
+            self.after_cancel(self._id_after_resultado_busca)
+            self._id_after_resultado_busca = None
+        self._executor_busca.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
     # --------------------------------------------------------------------------
     # Manipuladores de Eventos (Callbacks)
     # --------------------------------------------------------------------------
@@ -252,13 +339,30 @@ class PainelAcaoBusca(ttk.Frame):
             self._resetar_estado_busca()
             return
 
-        if self._botao_limpar:
-            self._botao_limpar.config(state=NORMAL)
+        self._aplicar_estado_ui(limpar=NORMAL, preview=False)
 
         self._id_after_busca = self.after(
             self.ATRASO_DEBOUNCE_BUSCA, self._executar_busca_real
         )
 
+    def _ao_confirmar_busca(self, _=None):
+        """
+        Callback do Enter no campo de busca. Se o termo digitado ainda não foi
+        buscado (debounce pendente) ou a busca ainda está em andamento, o
+        registro aguarda os resultados do termo atual em vez de usar a seleção
+        anterior.
+        """
+        if self._id_after_busca is not None:
+            self.after_cancel(self._id_after_busca)
+            self._executar_busca_real()
+        if self._busca_em_andamento:
+            self._registrar_apos_busca = True
+            return
+        # Resultados aplicados agora mesmo (termo em cache) já selecionaram a
+        # primeira linha, mas o <<TreeviewSelect>> dela ainda está na fila.
+        self._ao_selecionar_estudante_elegivel()
+        self._registrar_elegivel_selecionado()
+
     def _ao_selecionar_estudante_elegivel(self, _=None):
         """
         Callback acionado quando um estudante é selecionado na lista de elegíveis.
@@ -266,35 +370,23 @@ class PainelAcaoBusca(ttk.Frame):
         if not self._tree_estudantes_elegiveis:
             return
 
-        iid_selecionado = self._tree_estudantes_elegiveis.obter_iid_selecionado()
-        if not iid_selecionado:
-            self._dados_elegivel_selecionado = None
-            self._atualizar_label_preview()
-            if self._botao_registrar:
-                self._botao_registrar.config(state=DISABLED)
-            return
-
+        self._dados_elegivel_selecionado = None
         try:
-            dados_estudante = next(
-                (d for d in self._dados_correspondencias_elegiveis_atuais
-                 if d.get("Pront") == iid_selecionado), None
-            )
-            if dados_estudante:
-                self._dados_elegivel_selecionado = dados_estudante
-                if self._botao_registrar:
-                    self._botao_registrar.config(state=NORMAL)
-            else:
-                logger.error("Inconsistência de dados para o prontuário: %s", iid_selecionado)
-                self._dados_elegivel_selecionado = None
-                if self._botao_registrar:
-                    self._botao_registrar.config(state=DISABLED)
+            iid_selecionado = self._tree_estudantes_elegiveis.obter_iid_selecionado()
+            if iid_selecionado:
+                self._dados_elegivel_selecionado = self._mapa_iid_para_estudante.get(
+                    iid_selecionado
+                )
+                if self._dados_elegivel_selecionado is None:
+                    logger.error(
+                        "Inconsistência de dados para o prontuário: %s", iid_selecionado
+                    )
         except (ValueError, IndexError, AttributeError, tk.TclError) as e:
             logger.exception("Erro ao processar seleção de elegível: %s", e)
-            self._dados_elegivel_selecionado = None
-            if self._botao_registrar:
-                self._botao_registrar.config(state=DISABLED)
         finally:
-            self._atualizar_label_preview()
+            self._aplicar_estado_ui(
+                registrar=NORMAL if self._dados_elegivel_selecionado else DISABLED
+            )
             
     # --------------------------------------------------------------------------
     # Lógica de Busca e Registro
@@ -319,12 +411,10 @@ class PainelAcaoBusca(ttk.Frame):
         logger.debug("Executando busca por: '%s' (ignorar grupos: %s)", termo_busca, pular_grupos)
 
         try:
-            elegiveis = self._fachada.obter_estudantes_para_sessao(
-                consumido=False, pular_grupos=pular_grupos
-            )
+            elegiveis = self._obter_elegiveis(pular_grupos)
         except ErroSessaoNaoAtiva:
             logger.error("Nenhuma sessão ativa para realizar a busca.")
-            elegiveis = []
+            elegiveis = self._indexar_elegiveis([], None)
         except Exception as e:
             logger.exception("Erro ao buscar elegíveis da fachada: %s", e)
             elegiveis = None
@@ -333,14 +423,115 @@ class PainelAcaoBusca(ttk.Frame):
             Messagebox.show_error("Erro", "Falha ao carregar lista de estudantes.", parent=self._app)
             return
 
-        if termo_busca in self.TERMOS_BUSCA_TODOS:
-            correspondencias = self._obter_elegiveis_nao_servidos(elegiveis)
-        else:
-            correspondencias = self._executar_busca_fuzzy(termo_busca, elegiveis)
+        self._seq_busca += 1
+        self._busca_pendente = (termo_busca, elegiveis)
+        self._busca_em_andamento = True
+        if self._resultados_busca_de is not elegiveis:
+            self._resultados_busca.clear()
+            self._resultados_busca_de = elegiveis
+        anterior = self._resultados_busca.get(termo_busca)
+        if anterior is not None:
+            # Termo já buscado sobre a mesma lista de elegíveis
+            self._aplicar_resultados_busca(self._seq_busca, anterior)
+            return
+
+        if termo_busca.lower() in self.TERMOS_BUSCA_TODOS:
+            self._aplicar_resultados_busca(
+                self._seq_busca,
+                self._obter_elegiveis_nao_servidos(elegiveis.estudantes),
+            )
+            return
+
+        futuro = self._executor_busca.submit(
+            self._executar_busca_fuzzy, termo_busca, elegiveis
+        )
+        self._monitorar_busca(self._seq_busca, termo_busca, futuro)
+
+    def _monitorar_busca(
+        self, seq: int, termo_busca: str, futuro: "Future[List[EstudanteElegivel]]"
+    ):
+        """
+        Aguarda, na thread da interface, o fim da busca fuzzy em segundo plano
+        e aplica o resultado. O Tk não pode ser chamado pela thread da busca.
+        """
+        self._id_after_resultado_busca = None
+        if seq != self._seq_busca:
+            # Uma busca mais recente já substituiu esta
+            return
+        if not futuro.done():
+            self._id_after_resultado_busca = self.after(
+                self.INTERVALO_VERIFICACAO_BUSCA,
+                self._monitorar_busca,
+                seq,
+                termo_busca,
+                futuro,
+            )
+            return
+        try:
+            correspondencias = futuro.result()
+        except Exception as e:
+            logger.exception("Erro na busca fuzzy por '%s': %s", termo_busca, e)
+            correspondencias = []
+        self._aplicar_resultados_busca(seq, correspondencias)
 
+    def _aplicar_resultados_busca(
+        self, seq: int, correspondencias: List[EstudanteElegivel]
+    ):
+        """Exibe os resultados, a menos que uma busca mais recente já exista."""
+        if seq != self._seq_busca:
+            return
+        if (
+            self._busca_pendente is not None
+            and self._busca_pendente[1] is self._resultados_busca_de
+        ):
+            termo = self._busca_pendente[0]
+            self._resultados_busca[termo] = correspondencias
+            self._resultados_busca.move_to_end(termo)
+            if len(self._resultados_busca) > self.TAMANHO_CACHE_RESULTADOS:
+                self._resultados_busca.popitem(last=False)
         self._dados_correspondencias_elegiveis_atuais = correspondencias
+        self._mapa_iid_para_estudante = {d.linha[1]: d for d in correspondencias}
         self._atualizar_treeview_elegiveis(correspondencias)
         self._auto_selecionar_primeiro_resultado()
+        self._busca_em_andamento = False
+        if self._registrar_apos_busca:
+            self._registrar_apos_busca = False
+            # <<TreeviewSelect>> da seleção automática ainda não foi processado
+            self._ao_selecionar_estudante_elegivel()
+            self._registrar_elegivel_selecionado()
+
+    def _invalidar_cache_elegiveis(self):
+        """Força a próxima busca a consultar a fachada novamente."""
+        self._cache_elegiveis = None
+        self._resultados_busca.clear()
+        self._resultados_busca_de = None
+
+    def _obter_elegiveis(self, pular_grupos: bool) -> IndiceElegiveis:
+        """
+        Retorna os elegíveis não servidos da sessão ativa, consultando a fachada
+        apenas quando os dados, a sessão ou o filtro de grupos mudaram.
+        """
+        fachada = self._fachada
+        chave = (
+            fachada.versao_dados,
+            fachada.id_sessao_ativa,
+            frozenset(fachada.excessao_grupos),
+            pular_grupos,
+        )
+        anterior = self._cache_elegiveis
+        if anterior is not None and anterior[0] == chave:
+            return anterior[1]
+
+        elegiveis = self._indexar_elegiveis(
+            self._converter_elegiveis(
+                fachada.obter_estudantes_para_sessao(
+                    consumido=False, pular_grupos=pular_grupos
+                )
+            ),
+            anterior[1] if anterior is not None else None,
+        )
+        self._cache_elegiveis = (chave, elegiveis)
+        return elegiveis
 
     def _registrar_elegivel_selecionado(self):
         """
@@ -350,8 +541,8 @@ class PainelAcaoBusca(ttk.Frame):
             logger.warning("Tentativa de registro sem aluno selecionado.")
             return
 
-        pront = self._dados_elegivel_selecionado.get("Pront")
-        nome = self._dados_elegivel_selecionado.get("Nome", "?")
+        pront = self._dados_elegivel_selecionado.pront
+        nome = self._dados_elegivel_selecionado.nome or "?"
         if not pront:
             Messagebox.show_error(
                 "Erro no Registro",
@@ -369,32 +560,31 @@ class PainelAcaoBusca(ttk.Frame):
                 str(resultado.get("prontuario", pront)),
                 str(resultado.get("nome", nome)),
                 str(resultado.get("turma", "")),
-                str(resultado.get("hora_consumo", datetime.now().strftime("%H:%M:%S"))),
+                str(resultado.get("hora_consumo") or time.strftime("%H:%M:%S")),
                 str(resultado.get("prato", "")),
             )
+            self._invalidar_cache_elegiveis()
             self._app.notificar_sucesso_registro(tupla_estudante)
             self.limpar_busca()
 
+        except ErroEstudanteJaConsumiu as e:
+            logger.warning("Falha ao registrar %s: %s", pront, e)
+            Messagebox.show_warning(
+                "Já Registrado",
+                f"{nome} ({pront})\nJá consta como registrado nesta sessão.",
+                parent=self._app,
+            )
+            self.limpar_busca()
         except Exception as e:
             logger.warning("Falha ao registrar %s: %s", pront, e)
-            if "já consumiu" in str(e).lower():
-                Messagebox.show_warning(
-                    "Já Registrado",
-                    f"{nome} ({pront})\nJá consta como registrado nesta sessão.",
-                    parent=self._app,
-                )
-                self.limpar_busca()
-            else:
-                Messagebox.show_error(
-                    "Erro no Registro",
-                    f"Não foi possível registrar o consumo para:\n{nome} ({pront})\nErro: {e}",
-                    parent=self._app,
-                )
+            Messagebox.show_error(
+                "Erro no Registro",
+                f"Não foi possível registrar o consumo para:\n{nome} ({pront})\nErro: {e}",
+                parent=self._app,
+            )
         finally:
             self._dados_elegivel_selecionado = None
-            self._atualizar_label_preview()
-            if self._botao_registrar:
-                self._botao_registrar.config(state=DISABLED)
+            self._aplicar_estado_ui(registrar=DISABLED)
                 
     # --------------------------------------------------------------------------
     # Métodos Auxiliares
@@ -402,123 +592,273 @@ class PainelAcaoBusca(ttk.Frame):
 
     def _resetar_estado_busca(self):
         """Limpa a lista de resultados e reseta os componentes relacionados."""
-        if self._botao_limpar:
-            self._botao_limpar.config(state=DISABLED)
+        # Descarta o resultado de uma busca que ainda esteja em andamento
+        self._seq_busca += 1
+        self._busca_em_andamento = False
+        self._registrar_apos_busca = False
         if self._tree_estudantes_elegiveis:
             self._tree_estudantes_elegiveis.deletar_linhas()
+            self._linhas_elegiveis_exibidas = {}
 
         self._dados_elegivel_selecionado = None
         self._dados_correspondencias_elegiveis_atuais = []
-
-        if self._botao_registrar:
-            self._botao_registrar.config(state=DISABLED)
-
-        self._atualizar_label_preview()
+        self._mapa_iid_para_estudante = {}
+        self._aplicar_estado_ui(limpar=DISABLED, registrar=DISABLED)
 
     def _obter_elegiveis_nao_servidos(
-        self, estudantes_elegiveis: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        self, estudantes_elegiveis: List[EstudanteElegivel]
+    ) -> List[EstudanteElegivel]:
         """Retorna todos os estudantes elegíveis que ainda não consumiram."""
         logger.debug("Filtrando %d alunos elegíveis.", len(estudantes_elegiveis))
-        
-        # Renomeia as chaves para corresponder ao que a busca fuzzy espera
-        elegiveis_formatados = [
-            {
-                "Pront": s.get("pront"),
-                "Nome": s.get("nome"),
-                "Turma": s.get("turma"),
-                "Prato": s.get("prato"),
-                "score": 100,  # Score fixo para ordenação
+        return sorted(estudantes_elegiveis, key=lambda x: x.nome_lower)
+
+    def _converter_elegiveis(
+        self, estudantes_elegiveis: List[Dict[str, Any]]
+    ) -> List[EstudanteElegivel]:
+        """
+        Converte os estudantes retornados pela fachada em `EstudanteElegivel`,
+        reaproveitando as chaves de busca de estudantes já vistos.
+        """
+        cache = self._cache_chaves_busca
+        convertidos: List[EstudanteElegivel] = []
+        for estudante in estudantes_elegiveis:
+            pront = estudante.get("pront") or ""
+            nome = estudante.get("nome") or ""
+            turma = estudante.get("turma")
+            prato = estudante.get("prato")
+            chaves = cache.get((pront, nome))
+            if chaves is None:
+                chaves = (
+                    nome.lower(),
+                    REGEX_LIMPEZA_PRONTUARIO.sub("", pront.lower()),
+                )
+                cache[(pront, nome)] = chaves
+            convertidos.append(
+                EstudanteElegivel(
+                    pront=pront,
+                    nome=nome,
+                    turma=turma,
+                    prato=prato,
+                    nome_lower=chaves[0],
+                    pront_limpo=chaves[1],
+                    linha=(
+                        nome or "N/A",
+                        pront or "N/A",
+                        turma or "N/A",
+                        prato or "Sem Reserva",
+                    ),
+                )
+            )
+        return convertidos
+
+    @classmethod
+    def _indexar_elegiveis(
+        cls,
+        estudantes: List[EstudanteElegivel],
+        anterior: Optional[IndiceElegiveis],
+    ) -> IndiceElegiveis:
+        """
+        Monta os vetores de busca alinhados com `estudantes` e os índices de
+        prontuário, reaproveitando os índices anteriores se os prontuários não
+        mudaram de posição.
+        """
+        pronts = [e.pront_limpo for e in estudantes]
+        if anterior is not None and anterior.pronts == pronts:
+            bigramas, pront_exato = anterior.bigramas, anterior.pront_exato
+            pronts_ordenados = anterior.pronts_ordenados
+        else:
+            bigramas = cls._construir_indice_bigramas(pronts)
+            pront_exato = {
+                pront: posicao for posicao, pront in enumerate(pronts) if pront
             }
-            for s in estudantes_elegiveis
-        ]
-        
-        elegiveis_formatados.sort(key=lambda x: x.get("Nome", "").lower())
-        return elegiveis_formatados
+            pronts_ordenados = sorted(
+                (pront, posicao) for posicao, pront in enumerate(pronts) if pront
+            )
+        return IndiceElegiveis(
+            estudantes=estudantes,
+            nomes=[e.nome_lower for e in estudantes],
+            pronts=pronts,
+            bigramas=bigramas,
+            pront_exato=pront_exato,
+            pronts_ordenados=pronts_ordenados,
+        )
 
+    @staticmethod
+    def _bigramas(texto: str) -> Set[str]:
+        return {texto[i : i + 2] for i in range(len(texto) - 1)}
+
+    @classmethod
+    def _construir_indice_bigramas(cls, valores: List[str]) -> Dict[str, List[int]]:
+        """Mapeia cada bigrama para as posições dos valores que o contêm."""
+        indice: Dict[str, List[int]] = {}
+        for posicao, valor in enumerate(valores):
+            for bigrama in cls._bigramas(valor):
+                indice.setdefault(bigrama, []).append(posicao)
+        return indice
+
+    @classmethod
+    def _candidatos_por_bigramas(
+        cls, termo: str, indice_bigramas: Dict[str, List[int]]
+    ) -> Optional[List[int]]:
+        """
+        Retorna as posições dos prontuários que compartilham algum bigrama com o
+        termo, ou None quando o termo é curto demais para usar o índice.
+        """
+        bigramas = cls._bigramas(termo)
+        if not bigramas:
+            return None
+        posicoes: Set[int] = set()
+        for bigrama in bigramas:
+            posicoes.update(indice_bigramas.get(bigrama, ()))
+        return sorted(posicoes)
+
+    @classmethod
     def _executar_busca_fuzzy(
-        self, termo_busca: str, estudantes_elegiveis: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        cls, termo_busca: str, elegiveis: IndiceElegiveis
+    ) -> List[EstudanteElegivel]:
         """
         Executa uma busca por aproximação (fuzzy) nos nomes e prontuários
         dos estudantes elegíveis.
         """
         termo_lower = termo_busca.lower().strip()
-        correspondencias = []
-        
+        estudantes = elegiveis.estudantes
+
         # Determina se a busca é por prontuário ou nome
-        busca_por_pront = bool(re.fullmatch(r"(?:[a-z]{2})?[\dx\s]+", termo_lower, re.IGNORECASE))
-        chave_busca = "pront" if busca_por_pront else "nome"
-        
+        busca_por_pront = bool(_RE_DETECTA_PRONT.fullmatch(termo_lower))
+
         termo_limpo = (
             REGEX_LIMPEZA_PRONTUARIO.sub("", termo_lower) if busca_por_pront else termo_lower
         )
-        
+
         limite_score = 85 if busca_por_pront else 70
 
-        for estudante in estudantes_elegiveis:
-            valor_campo = estudante.get(chave_busca, "")
-            if not valor_campo:
-                continue
-
-            valor_comparar = (
-                REGEX_LIMPEZA_PRONTUARIO.sub("", valor_campo.lower())
-                if busca_por_pront
-                else valor_campo.lower()
+        # Prontuário digitado por completo: a resposta é determinística
+        if busca_por_pront and (
+            posicao := elegiveis.pront_exato.get(termo_limpo)
+        ) is not None:
+            return [estudantes[posicao]]
+
+        # Início de prontuário: os que começam pelo termo vêm direto do índice
+        # ordenado; a pontuação fuzzy só roda se nenhum começar por ele.
+        if busca_por_pront and termo_limpo:
+            ordenados = elegiveis.pronts_ordenados
+            inicio = bisect.bisect_left(ordenados, (termo_limpo,))
+            fim = bisect.bisect_left(ordenados, (termo_limpo + "\uffff",), inicio)
+            if inicio < fim:
+                return heapq.nsmallest(
+                    cls.LIMITE_RESULTADOS_BUSCA,
+                    (estudantes[posicao] for _, posicao in ordenados[inicio:fim]),
+                    key=lambda e: e.nome_lower,
+                )
+
+        valores_comparar = elegiveis.pronts if busca_por_pront else elegiveis.nomes
+        # Para prontuários, só pontua quem compartilha um bigrama com o termo:
+        # com score mínimo de 85, uma correspondência do partial_ratio sempre
+        # compartilha algum (trigramas não bastam, ex.: "4192" x "41224").
+        # Sem nenhum candidato, pontua todos: o filtro nunca pode esconder uma
+        # correspondência, só evitar trabalho.
+        posicoes: Optional[List[int]] = None
+        if busca_por_pront:
+            posicoes = (
+                cls._candidatos_por_bigramas(termo_limpo, elegiveis.bigramas)
+                or None
+            )
+        if posicoes is not None:
+            valores_comparar = [valores_comparar[i] for i in posicoes]
+
+        # Correspondências exatas de substring já têm score 100. Se elas sozinhas
+        # preenchem o limite exibido, nenhuma outra poderia superá-las e a
+        # pontuação fuzzy é dispensada.
+        exatas = [
+            i
+            for i, valor in enumerate(valores_comparar)
+            if valor and (termo_limpo in valor or valor in termo_limpo)
+        ]
+        if len(exatas) >= cls.LIMITE_RESULTADOS_BUSCA:
+            if posicoes is not None:
+                exatas = [posicoes[i] for i in exatas]
+            return heapq.nsmallest(
+                cls.LIMITE_RESULTADOS_BUSCA,
+                (estudantes[i] for i in exatas),
+                key=lambda e: e.nome_lower,
             )
-            
-            score = fuzz.partial_ratio(termo_limpo, valor_comparar)
 
+        # Todos os candidatos são pontuados em uma única chamada nativa, sobre o
+        # vetor de chaves já alinhado com a lista de estudantes. Valores vazios
+        # pontuam 0 e ficam abaixo do corte.
+        resultados = process.extract(
+            termo_limpo,
+            valores_comparar,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=limite_score,
+            limit=None,
+        )
+
+        correspondencias = []
+        for valor_comparar, score, indice in resultados:
             if busca_por_pront and termo_limpo == valor_comparar:
                 score = 100
+            if posicoes is not None:
+                indice = posicoes[indice]
+            correspondencias.append((round(score), estudantes[indice]))
+
+        # Apenas os melhores resultados são exibidos; evita ordenar a lista toda
+        melhores = heapq.nsmallest(
+            cls.LIMITE_RESULTADOS_BUSCA,
+            correspondencias,
+            key=lambda x: (-x[0], x[1].nome_lower),
+        )
+        return [estudante for _, estudante in melhores]
 
-            if score >= limite_score:
-                copia_estudante = {
-                    "Pront": estudante.get("pront"),
-                    "Nome": estudante.get("nome"),
-                    "Turma": estudante.get("turma"),
-                    "Prato": estudante.get("prato"),
-                    "score": score,
-                }
-                correspondencias.append(copia_estudante)
-
-        correspondencias.sort(key=lambda x: (-x["score"], x.get("Nome", "").lower()))
-        return correspondencias
-
-    def _atualizar_treeview_elegiveis(self, dados: List[Dict[str, Any]]):
+    def _atualizar_treeview_elegiveis(self, dados: List[EstudanteElegivel]):
         """
         Atualiza a tabela de estudantes elegíveis com os resultados da busca.
         """
         if not self._tree_estudantes_elegiveis:
             return
 
-        self._tree_estudantes_elegiveis.deletar_linhas()
-        if not dados:
-            return
-
-        linhas_para_inserir = []
-        for item in dados:
-            status_prato = item.get("Prato") or "Sem Reserva"
-            linha = (
-                str(item.get("Nome", "N/A")),
-                str(item.get("Pront", "N/A")),
-                str(item.get("Turma", "N/A")),
-                str(status_prato),
-            )
-            linhas_para_inserir.append(linha)
-
+        # O IID (identificador do item) será o prontuário
+        novas = {item.linha[1]: item.linha for item in dados}
         try:
-            view = self._tree_estudantes_elegiveis.view
-            for linha in linhas_para_inserir:
-                # O IID (identificador do item) será o prontuário
-                view.insert("", tk.END, iid=linha[1], values=linha)
-            self._tree_estudantes_elegiveis.apply_zebra_striping()
+            if self._tree_estudantes_elegiveis.sincronizar_linhas(
+                self._linhas_elegiveis_exibidas, novas
+            ):
+                self._linhas_elegiveis_exibidas = novas
         except Exception as e:
             logger.exception("Erro ao construir tabela de elegíveis: %s", e)
+            # O estado da tabela é desconhecido; recomeça do zero na próxima busca
+            self._linhas_elegiveis_exibidas = {}
+            try:
+                self._tree_estudantes_elegiveis.deletar_linhas()
+            except tk.TclError:
+                pass
             Messagebox.show_error(
                 "Erro de UI", "Não foi possível exibir os resultados.", parent=self._app
             )
 
+    def _aplicar_estado_ui(
+        self,
+        entrada: Optional[str] = None,
+        limpar: Optional[str] = None,
+        registrar: Optional[str] = None,
+        preview: bool = True,
+    ):
+        """
+        Aplica de uma vez o estado dos controles do painel. Cada widget só é
+        reconfigurado se o estado pedido for diferente do último aplicado,
+        evitando chamadas Tcl redundantes.
+        """
+        for chave, widget, estado in (
+            ("entrada", self._entrada_busca, entrada),
+            ("limpar", self._botao_limpar, limpar),
+            ("registrar", self._botao_registrar, registrar),
+        ):
+            if widget and estado is not None and self._estados_ui.get(chave) != estado:
+                widget.config(state=estado)
+                self._estados_ui[chave] = estado
+        if preview:
+            self._atualizar_label_preview()
+
     def _atualizar_label_preview(self, erro: bool = False):
         """Atualiza o texto e o estilo do label de pré-visualização."""
         if not self._label_aluno_selecionado:
@@ -528,41 +868,53 @@ class PainelAcaoBusca(ttk.Frame):
             texto = "Erro ao obter dados do aluno."
             estilo = "inverse-danger"
         elif self._dados_elegivel_selecionado:
-            pront = self._dados_elegivel_selecionado.get("Pront", "?")
-            nome = self._dados_elegivel_selecionado.get("Nome", "?")
-            turma = self._dados_elegivel_selecionado.get("Turma", "S/ Turma")
-            prato = self._dados_elegivel_selecionado.get("Prato") or "Sem Reserva"
+            pront = self._dados_elegivel_selecionado.pront or "?"
+            nome = self._dados_elegivel_selecionado.nome or "?"
+            turma = self._dados_elegivel_selecionado.turma or "S/ Turma"
+            prato = self._dados_elegivel_selecionado.prato or "Sem Reserva"
             texto = f"Pront: {pront}\nNome: {nome}\nTurma: {turma}\nPrato: {prato}"
             estilo = "inverse-primary"
         else:
             texto = "Pesquise um aluno."
             estilo = "inverse-info"
 
-        self._label_aluno_selecionado.config(text=texto, bootstyle=estilo)
+        if self._preview_aplicado != (texto, estilo):
+            self._label_aluno_selecionado.config(text=texto, bootstyle=estilo)
+            self._preview_aplicado = (texto, estilo)
 
     def _selecionar_proximo_elegivel(self, delta: int):
         """
         Move a seleção na lista de elegíveis para cima ou para baixo.
         `delta` pode ser 1 (para baixo) ou -1 (para cima).
         """
-        if (not self._tree_estudantes_elegiveis or
-                not self._tree_estudantes_elegiveis.obter_iids_filhos()):
+        if not self._tree_estudantes_elegiveis:
             return
 
-        lista_iids = self._tree_estudantes_elegiveis.obter_iids_filhos()
-        iid_selecionado = self._tree_estudantes_elegiveis.obter_iid_selecionado()
-        tamanho = len(lista_iids)
+        # A ordem vem das linhas exibidas (já conhecidas em Python) e a seleção
+        # atual de `_dados_elegivel_selecionado`, sem consultar a tabela.
+        linhas = self._linhas_elegiveis_exibidas
+        if self._ordem_exibida_de is not linhas:
+            self._ordem_exibida = tuple(linhas)
+            self._posicoes_exibidas = {
+                iid: i for i, iid in enumerate(self._ordem_exibida)
+            }
+            self._ordem_exibida_de = linhas
+        lista_iids = self._ordem_exibida
+        if not lista_iids:
+            return
 
-        try:
-            indice_atual = lista_iids.index(iid_selecionado) if iid_selecionado else -1
-            proximo_indice = (indice_atual + delta) % tamanho
-            proximo_iid = lista_iids[proximo_indice]
+        selecionado = self._dados_elegivel_selecionado
+        indice_atual = (
+            self._posicoes_exibidas.get(selecionado.linha[1], -1) if selecionado else -1
+        )
+        proximo_iid = lista_iids[(indice_atual + delta) % len(lista_iids)]
 
+        try:
             view = self._tree_estudantes_elegiveis.view
             view.focus(proximo_iid)
             view.selection_set(proximo_iid)
             view.see(proximo_iid)
-        except (ValueError, IndexError) as e:
+        except tk.TclError as e:
             logger.warning("Erro ao navegar na lista de elegíveis: %s", e)
 
     def _auto_selecionar_primeiro_resultado(self):
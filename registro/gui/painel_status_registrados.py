@@ -5,8 +5,10 @@
 # Copyright (c) 2024-2025 Mateus G Pereira <mateus.pereira@ifsp.edu.br>
 
 import logging
+import time
 import tkinter as tk
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import CENTER, PRIMARY, WARNING
@@ -26,6 +28,62 @@ logger = logging.getLogger(__name__)
 class PainelStatusRegistrados(ttk.Frame):
     ID_COLUNA_ACAO = "coluna_acao"
     TEXTO_COLUNA_ACAO = "❌"
+    # Atraso (ms) para agrupar pedidos seguidos de atualização dos contadores
+    ATRASO_ATUALIZACAO_CONTADORES = 50
+    # Intervalo (s) em que a mesma mensagem de erro não é exibida de novo
+    INTERVALO_ERRO_REPETIDO = 1.0
+    # Campos do estudante exibidos antes do prato, na ordem das colunas
+    _CAMPOS_LINHA = itemgetter("pront", "nome", "turma", "hora_consumo")
+    # Definição das colunas (não é alterada por TreeviewSimples)
+    COLUNAS_REGISTRADOS: Tuple[Dict[str, Any], ...] = (
+        {
+            "text": "🆔 Pront.",
+            "stretch": False,
+            "width": 100,
+            "iid": "pront",
+            "minwidth": 80,
+        },
+        {
+            "text": "✍️ Nome",
+            "stretch": True,
+            "iid": "nome",
+            "minwidth": 150,
+        },
+        {
+            "text": "👥 Turma",
+            "stretch": False,
+            "width": 150,
+            "iid": "turma",
+            "minwidth": 100,
+        },
+        {
+            "text": "⏱️ Hora",
+            "stretch": False,
+            "width": 70,
+            "anchor": CENTER,
+            "iid": "hora",
+            "minwidth": 60,
+        },
+        {
+            "text": "🍽️ Prato/Status",
+            "stretch": True,
+            "width": 150,
+            "iid": "prato",
+            "minwidth": 100,
+        },
+        {
+            "text": TEXTO_COLUNA_ACAO,
+            "stretch": False,
+            "width": 40,
+            "anchor": CENTER,
+            "iid": ID_COLUNA_ACAO,
+            "minwidth": 30,
+        },
+    )
+    # Todas menos a de ação, que é a última
+    COLUNAS_ORDENAVEIS: Tuple[str, ...] = tuple(
+        cd["iid"] for cd in COLUNAS_REGISTRADOS[:-1]
+    )
 
     def __init__(
         self,
@@ -43,68 +101,32 @@ class PainelStatusRegistrados(ttk.Frame):
 
         self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(0, weight=1)
-        self._definicao_cols_registrados: List[Dict[str, Any]] = []
+        # Símbolo ("#n") da coluna de ação, como retornado por identify_column
+        self._simbolo_coluna_acao: str = ""
+        # (consulta, consumido, pular_grupos) -> (chave de versão, resultado) da
+        # última consulta à fachada; uma atualização do painel reaproveita a
+        # lista de registrados já carregada em vez de consultá-la de novo.
+        self._cache_consultas: Dict[Tuple[str, bool, bool], Tuple[Tuple, Any]] = {}
+        # Recarga da tabela agendada para quando a interface estiver ociosa
+        self._id_after_carga: Optional[str] = None
+        self._id_after_contadores: Optional[str] = None
+        # (mensagem, instante em que foi fechada) do último erro exibido
+        self._ultimo_erro: Optional[Tuple[str, float]] = None
+        # Último (texto, estilo) aplicado a cada label de contagem
+        self._contadores_aplicados: Dict[str, Tuple[str, str]] = {}
+        # Linhas atualmente exibidas na tabela (IID = prontuário), em ordem
+        self._linhas_exibidas: Dict[str, Tuple[str, ...]] = {}
 
         self._criar_tabela_registrados()
         self._criar_area_contadores()
 
         if self._tabela_estudantes_registrados:
-            self._tabela_estudantes_registrados.view.bind(
-                "<Button-1>", self._ao_clicar_tabela_registrados
-            )
-            self._tabela_estudantes_registrados.view.bind(
-                "<Delete>", self._ao_teclar_delete_tabela
-            )
-            self._tabela_estudantes_registrados.view.bind(
-                "<BackSpace>", self._ao_teclar_delete_tabela
-            )
-
-    def _obter_definicao_cols_registrados(self) -> List[Dict[str, Any]]:
-        return [
-            {
-                "text": "🆔 Pront.",
-                "stretch": False,
-                "width": 100,
-                "iid": "pront",
-                "minwidth": 80,
-            },
-            {
-                "text": "✍️ Nome",
-                "stretch": True,
-                "iid": "nome",
-                "minwidth": 150,
-            },
-            {
-                "text": "👥 Turma",
-                "stretch": False,
-                "width": 150,
-                "iid": "turma",
-                "minwidth": 100,
-            },
-            {
-                "text": "⏱️ Hora",
-                "stretch": False,
-                "width": 70,
-                "anchor": CENTER,
-                "iid": "hora",
-                "minwidth": 60,
-            },
-            {
-                "text": "🍽️ Prato/Status",
-                "stretch": True,
-                "width": 150,
-                "iid": "prato",
-                "minwidth": 100,
-            },
-            {
-                "text": self.TEXTO_COLUNA_ACAO,
-                "stretch": False,
-                "width": 40,
-                "anchor": CENTER,
-                "iid": self.ID_COLUNA_ACAO,
-                "minwidth": 30,
-            },
-        ]
+            view = self._tabela_estudantes_registrados.view
+            view.bind("<Button-1>", self._ao_clicar_tabela_registrados)
+            view.bind("<Delete>", self._ao_teclar_delete_tabela)
+            # Reaproveita o script (e o comando Tcl) já criado para <Delete>,
+            # em vez de registrar outro callback Python para o mesmo método.
+            view.bind("<BackSpace>", view.bind("<Delete>"))
 
     def _criar_area_contadores(self):
         frame_contadores = ttk.Frame(self, padding=(5, 5))
@@ -133,10 +155,9 @@ class PainelStatusRegistrados(ttk.Frame):
         self._label_contagem_restantes.grid(row=0, column=1, sticky="ew", padx=(5, 0))
 
     def _criar_tabela_registrados(self):
-        self._definicao_cols_registrados = self._obter_definicao_cols_registrados()
         self._tabela_estudantes_registrados = TreeviewSimples(
             master=self,
-            dados_colunas=self._definicao_cols_registrados,
+            dados_colunas=list(self.COLUNAS_REGISTRADOS),
             height=15,
             enable_hover=True,
             # header_bootstyle="dark",
@@ -145,63 +166,167 @@ class PainelStatusRegistrados(ttk.Frame):
             row=1, column=0, sticky="nsew", pady=(0, 10)
         )
 
-        cols_ordenaveis = [
-            str(cd.get("iid"))
-            for cd in self._definicao_cols_registrados
-            if cd.get("iid") and cd.get("iid") != self.ID_COLUNA_ACAO
-        ]
+        indice_acao = self._tabela_estudantes_registrados.ids_colunas.index(
+            self.ID_COLUNA_ACAO
+        )
+        self._simbolo_coluna_acao = f"#{indice_acao + 1}"
+
         self._tabela_estudantes_registrados.configurar_ordenacao(
-            colunas_ordenaveis=cols_ordenaveis or None
+            colunas_ordenaveis=list(self.COLUNAS_ORDENAVEIS)
+        )
+
+    def _consultar_em_cache(
+        self, consulta: Tuple[str, bool, bool], obter: Callable[[], Any]
+    ) -> Any:
+        """
+        Retorna o resultado de `obter`, chamando-o apenas quando os dados, a
+        sessão ou os grupos de exceção mudaram desde a última consulta igual.
+        """
+        fachada = self._fachada
+        chave = (
+            fachada.versao_dados,
+            fachada.id_sessao_ativa,
+            frozenset(fachada.excessao_grupos),
+        )
+        anterior = self._cache_consultas.get(consulta)
+        if anterior is not None and anterior[0] == chave:
+            return anterior[1]
+
+        resultado = obter()
+        self._cache_consultas[consulta] = (chave, resultado)
+        return resultado
+
+    def _obter_estudantes_sessao(
+        self, consumido: bool, pular_grupos: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Retorna os estudantes da sessão ativa, os últimos registrados primeiro
+        (ver `_consultar_em_cache`).
+        """
+        return self._consultar_em_cache(
+            ("estudantes", consumido, pular_grupos),
+            lambda: self._fachada.obter_estudantes_para_sessao(
+                consumido=consumido,
+                pular_grupos=pular_grupos,
+                ordenar_por_consumo=True,
+            ),
+        )
+
+    def _contar_estudantes_sessao(
+        self, consumido: bool, pular_grupos: bool = False
+    ) -> int:
+        """Conta os estudantes da sessão ativa (ver `_consultar_em_cache`)."""
+        return self._consultar_em_cache(
+            ("contagem", consumido, pular_grupos),
+            lambda: self._fachada.contar_estudantes_para_sessao(
+                consumido=consumido, pular_grupos=pular_grupos
+            ),
         )
 
     def carregar_estudantes_registrados(self):
-        if not self._tabela_estudantes_registrados:
+        """
+        Agenda o recarregamento da tabela para quando a interface estiver
+        ociosa, deixando o evento que o pediu terminar (e a tela ser redesenhada)
+        antes da consulta. Pedidos feitos até lá são atendidos por uma só carga.
+
+        A consulta em si continua na thread da interface: a sessão SQLAlchemy
+        da fachada é compartilhada com o registro e a busca, e não pode ser
+        usada por outra thread.
+        """
+        if self._id_after_carga is None:
+            self._id_after_carga = self.after_idle(
+                self._carregar_estudantes_registrados_agora
+            )
+
+    def destroy(self):
+        """Cancela atualizações ainda agendadas antes de destruir o painel."""
+        self._cancelar_carga_agendada()
+        if self._id_after_contadores is not None:
+            self.after_cancel(self._id_after_contadores)
+            self._id_after_contadores = None
+        super().destroy()
+
+    def _cancelar_carga_agendada(self):
+        if self._id_after_carga is not None:
+            self.after_cancel(self._id_after_carga)
+            self._id_after_carga = None
+
+    def _carregar_estudantes_registrados_agora(self):
+        self._id_after_carga = None
+        tabela = self._tabela_estudantes_registrados
+        if not tabela:
             return
         logger.debug("Carregando tabela de registrados...")
         try:
-            dados_servidos = self._fachada.obter_estudantes_para_sessao(
+            dados_servidos = self._obter_estudantes_sessao(
                 consumido=True, pular_grupos=True
             )
-            if dados_servidos:
-                linhas_com_acao = []
-                for estudante in dados_servidos:
-                    display_prato = estudante.get("prato") or "Sem Reserva"
-                    linha = (
-                        estudante.get("pront", ""),
-                        estudante.get("nome", ""),
-                        estudante.get("turma", ""),
-                        estudante.get("hora_consumo", ""),
-                        display_prato,
-                    )
-                    linha_final = tuple(map(str, linha)) + (self.TEXTO_COLUNA_ACAO,)
-                    linhas_com_acao.append(linha_final)
-
-                self._tabela_estudantes_registrados.construir_dados_tabela(
-                    dados_linhas=sorted(
-                        linhas_com_acao, key=lambda l: l[3], reverse=True
-                    )
+            campos, acao = self._CAMPOS_LINHA, self.TEXTO_COLUNA_ACAO
+            # O prontuário identifica a linha: só as que mudaram são refeitas
+            novas = {
+                estudante["pront"]: (
+                    *campos(estudante),
+                    estudante["prato"] or "Sem Reserva",
+                    acao,
                 )
-                logger.info("%d alunos registrados carregados.", len(linhas_com_acao))
-            else:
-                self._tabela_estudantes_registrados.deletar_linhas()
-                logger.info("Nenhum aluno registrado para exibir.")
+                for estudante in dados_servidos
+            }
+            if tabela.sincronizar_linhas(self._linhas_exibidas, novas):
+                self._linhas_exibidas = novas
+            logger.info("%d alunos registrados carregados.", len(novas))
             self.atualizar_contadores()
         except ErroSessaoNaoAtiva:
             logger.warning("Tentativa de carregar registrados sem sessão ativa.")
-            self._tabela_estudantes_registrados.deletar_linhas()
+            self._deletar_todas_linhas()
             self.atualizar_contadores()
         except Exception as e:
             logger.exception("Erro ao carregar tabela de registrados: %s", e)
-            Messagebox.show_error(
+            self._reportar_erro(
                 "Erro",
                 "Não foi possível carregar a lista de registrados.",
-                parent=self._app,
             )
-            if self._tabela_estudantes_registrados:
-                self._tabela_estudantes_registrados.deletar_linhas()
+            self._deletar_todas_linhas()
             self.atualizar_contadores()
 
+    def _reportar_erro(self, titulo: str, mensagem: str):
+        """
+        Exibe uma mensagem de erro, a menos que a mesma mensagem ainda esteja
+        aberta ou tenha sido fechada há menos de `INTERVALO_ERRO_REPETIDO` s.
+        """
+        ultimo = self._ultimo_erro
+        if (
+            ultimo is not None
+            and ultimo[0] == mensagem
+            and time.monotonic() - ultimo[1] < self.INTERVALO_ERRO_REPETIDO
+        ):
+            logger.debug("Erro repetido não exibido: %s", mensagem)
+            return
+        # Enquanto o diálogo está aberto, repetições são sempre suprimidas
+        self._ultimo_erro = (mensagem, float("inf"))
+        try:
+            Messagebox.show_error(titulo, mensagem, parent=self._app)
+        finally:
+            self._ultimo_erro = (mensagem, time.monotonic())
+
+    def _deletar_todas_linhas(self):
+        if self._tabela_estudantes_registrados:
+            self._tabela_estudantes_registrados.deletar_linhas()
+        self._linhas_exibidas = {}
+
     def atualizar_contadores(self):
+        """
+        Agenda a atualização dos contadores. Pedidos feitos dentro de
+        `ATRASO_ATUALIZACAO_CONTADORES` ms do anterior o substituem, de modo que
+        uma rajada de mudanças consulta a fachada uma única vez.
+        """
+        if self._id_after_contadores is not None:
+            self.after_cancel(self._id_after_contadores)
+        self._id_after_contadores = self.after(
+            self.ATRASO_ATUALIZACAO_CONTADORES, self._atualizar_contadores_agora
+        )
+
+    def _atualizar_contadores_agora(self):
+        self._id_after_contadores = None
         if not self._label_contagem_registrados or not self._label_contagem_restantes:
             return
 
@@ -210,14 +335,12 @@ class PainelStatusRegistrados(ttk.Frame):
         estilo_reg, estilo_rem = "secondary", "secondary"
 
         try:
-            lista_registrados = self._fachada.obter_estudantes_para_sessao(
-                consumido=True, pular_grupos=True
-            )
-            lista_elegiveis = self._fachada.obter_estudantes_para_sessao(
-                consumido=False
+            # A lista de registrados já é carregada para a tabela; dos restantes
+            # basta a contagem.
+            contagem_registrados = len(
+                self._obter_estudantes_sessao(consumido=True, pular_grupos=True)
             )
-            contagem_registrados = len(lista_registrados)
-            contagem_restantes = len(lista_elegiveis)
+            contagem_restantes = self._contar_estudantes_sessao(consumido=False)
             total_elegiveis = contagem_registrados + contagem_restantes
             texto_reg = f"Registrados: {contagem_registrados}"
             texto_rem = (
@@ -232,25 +355,38 @@ class PainelStatusRegistrados(ttk.Frame):
             texto_reg, texto_rem = "Registrados: Erro", "Elegíveis: Erro"
             estilo_reg, estilo_rem = "danger", "danger"
 
-        self._label_contagem_registrados.config(
-            text=texto_reg, bootstyle=estilo_reg  # type: ignore
-        )
-        self._label_contagem_restantes.config(
-            text=texto_rem, bootstyle=estilo_rem  # type: ignore
-        )
+        for chave, label, texto, estilo in (
+            ("registrados", self._label_contagem_registrados, texto_reg, estilo_reg),
+            ("restantes", self._label_contagem_restantes, texto_rem, estilo_rem),
+        ):
+            anterior = self._contadores_aplicados.get(chave)
+            if anterior == (texto, estilo):
+                continue
+            # bootstyle refaz o estilo ttk do widget; só é aplicado se mudou
+            if anterior is None or anterior[1] != estilo:
+                label.config(text=texto, bootstyle=estilo)  # type: ignore
+            else:
+                label.config(text=texto)
+            self._contadores_aplicados[chave] = (texto, estilo)
 
     def limpar_tabela(self):
         logger.debug("Limpando tabela de registrados e contadores.")
-        if self._tabela_estudantes_registrados:
-            self._tabela_estudantes_registrados.deletar_linhas()
+        self._cancelar_carga_agendada()
+        self._deletar_todas_linhas()
         self.atualizar_contadores()
 
     def remover_linha_da_tabela(self, iid_para_deletar: str):
-        if not self._tabela_estudantes_registrados:
+        tabela = self._tabela_estudantes_registrados
+        if not tabela:
             return
         try:
-            if self._tabela_estudantes_registrados.view.exists(iid_para_deletar):
-                self._tabela_estudantes_registrados.deletar_linhas([iid_para_deletar])
+            if tabela.view.exists(iid_para_deletar):
+                tabela.deletar_linhas([iid_para_deletar])
+                self._linhas_exibidas = {
+                    iid: linha
+                    for iid, linha in self._linhas_exibidas.items()
+                    if iid != iid_para_deletar
+                }
                 logger.debug("Linha %s removida da UI.", iid_para_deletar)
                 self.atualizar_contadores()
             else:
@@ -263,52 +399,45 @@ class PainelStatusRegistrados(ttk.Frame):
             self.carregar_estudantes_registrados()
 
     def _ao_clicar_tabela_registrados(self, event: tk.Event):
-        if not self._tabela_estudantes_registrados:
+        tabela = self._tabela_estudantes_registrados
+        if not tabela:
             return
-        iid, id_col = self._tabela_estudantes_registrados.identificar_celula_clicada(
-            event
-        )
-
+        # Focar e selecionar a linha clicada fica a cargo do próprio Treeview
+        # (binding de classe); aqui só interessam cliques na coluna de ação,
+        # e os demais são descartados com uma única consulta ao Tcl.
+        if tabela.view.identify_column(event.x) != self._simbolo_coluna_acao:
+            return
+        iid, id_col = tabela.identificar_celula_clicada(event)
         if iid and id_col == self.ID_COLUNA_ACAO:
             logger.debug("Coluna de ação clicada para iid: %s", iid)
             self._confirmar_e_deletar_consumo(iid)
-        elif iid and self._tabela_estudantes_registrados.view.exists(iid):
-            if id_col != self.ID_COLUNA_ACAO:
-                try:
-                    self._tabela_estudantes_registrados.view.focus(iid)
-                    if (
-                        self._tabela_estudantes_registrados.obter_iid_selecionado()
-                        != iid
-                    ):
-                        self._tabela_estudantes_registrados.view.selection_set(iid)
-                except tk.TclError as e:
-                    logger.warning("Erro Tcl ao focar/selecionar linha %s: %s", iid, e)
 
     def _ao_teclar_delete_tabela(self, _=None):
-        if not self._tabela_estudantes_registrados:
+        tabela = self._tabela_estudantes_registrados
+        if not tabela:
             return
-        iid_selecionado = self._tabela_estudantes_registrados.obter_iid_selecionado()
+        iid_selecionado = tabela.obter_iid_selecionado()
         if iid_selecionado:
             logger.debug("Tecla Delete pressionada para iid: %s", iid_selecionado)
             self._confirmar_e_deletar_consumo(iid_selecionado)
 
     def _confirmar_e_deletar_consumo(self, iid_para_deletar: str):
-        if not self._tabela_estudantes_registrados:
+        tabela = self._tabela_estudantes_registrados
+        if not tabela:
             return
 
-        valores_linha = self._tabela_estudantes_registrados.obter_valores_linha(
+        # Os valores exibidos já são conhecidos; a tabela só é consultada para
+        # linhas fora do snapshot.
+        valores_linha = self._linhas_exibidas.get(
             iid_para_deletar
-        )
-        if not valores_linha or len(valores_linha) != len(
-            self._definicao_cols_registrados
-        ):
+        ) or tabela.obter_valores_linha(iid_para_deletar)
+        if not valores_linha or len(valores_linha) != len(self.COLUNAS_REGISTRADOS):
             logger.error(
                 "Não foi possível obter valores para iid %s.", iid_para_deletar
             )
-            Messagebox.show_error(
+            self._reportar_erro(
                 "Erro Interno",
                 "Erro ao obter dados da linha.",
-                parent=self._app,
             )
             return
 
@@ -319,10 +448,9 @@ class PainelStatusRegistrados(ttk.Frame):
                 raise ValueError("Prontuário vazio.")
         except (IndexError, ValueError) as e:
             logger.error("Erro ao extrair dados da linha %s: %s.", iid_para_deletar, e)
-            Messagebox.show_error(
+            self._reportar_erro(
                 "Erro de Dados",
                 "Erro ao processar dados da linha.",
-                parent=self._app,
             )
             return
 
@@ -8,7 +8,8 @@ e classificação das linhas de dados importadas. Este é o cérebro do sistema.
 import re
 from typing import Dict, List, Optional, Sequence
 
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz
+from rapidfuzz.utils import default_process
 
 from registro.importar.definitions import LimiaresConfianca, LinhaAnalisada, SugestaoMatch
 from registro.nucleo.models import Estudante
@@ -59,7 +60,11 @@ class AnalisadorDeLinhas:
         if prontuario:
             for est in self._cache_estudantes:
                 if est.prontuario == prontuario:
-                    pontuacao_nome = fuzz.token_sort_ratio(nome_limpo, est.nome.lower())
+                    pontuacao_nome = round(
+                        fuzz.token_sort_ratio(
+                            nome_limpo, est.nome.lower(), processor=default_process
+                        )
+                    )
                     return [
                         {
                             "id": est.id,
@@ -71,7 +76,11 @@ class AnalisadorDeLinhas:
 
         # Se não há prontuário ou não encontrou, faz fuzzy matching por nome.
         for est in self._cache_estudantes:
-            pontuacao = fuzz.token_sort_ratio(nome_limpo, est.nome.lower())
+            pontuacao = round(
+                fuzz.token_sort_ratio(
+                    nome_limpo, est.nome.lower(), processor=default_process
+                )
+            )
             if pontuacao >= self._limiares["match_ambiguo"]:
                 sugestoes.append(
                     {
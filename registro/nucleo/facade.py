@@ -12,7 +12,8 @@ os repositórios e a lógica de serviço.
 import re
 from typing import Any, Dict, List, Optional, Sequence, Set
 
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
+from sqlalchemy import event
 
 from registro.nucleo import service_logic
 from registro.nucleo.exceptions import ErroSessaoNaoAtiva
@@ -55,6 +56,13 @@ class FachadaRegistro:
         self.id_sessao_ativa: Optional[int] = None
         self.excessao_grupos: Set[str] = set()
 
+        # Incrementada a cada commit; permite que clientes invalidem caches.
+        self.versao_dados: int = 0
+        event.listen(self._sessao_db, "after_commit", self._ao_confirmar_transacao)
+
+    def _ao_confirmar_transacao(self, _sessao):
+        self.versao_dados += 1
+
     def fechar_conexao(self):
         """Fecha a conexão com o banco de dados."""
         self._sessao_db.close()
@@ -78,7 +86,10 @@ class FachadaRegistro:
         return id_sessao
 
     def listar_todas_sessoes(self) -> List[Dict[str, Any]]:
-        """Retorna uma lista simplificada de todas as sessões."""
+        """
+        Retorna uma lista simplificada das sessões, ordenada da mais recente
+        para a mais antiga.
+        """
         return service_logic.listar_todas_sessoes(self.repo_sessao)
 
     def listar_todos_os_grupos(self) -> List[Dict[str, Any]]:
@@ -195,7 +206,7 @@ class FachadaRegistro:
     ) -> List[Dict[str, Any]]:
         """
         Lista estudantes. Se um termo de busca é fornecido, realiza uma busca
-        fuzzy com fuzzywuzzy por nome ou prontuário e ordena por relevância.
+        fuzzy com rapidfuzz por nome ou prontuário e ordena por relevância.
         """
 
         if not termo_busca or not termo_busca.strip():
@@ -206,23 +217,26 @@ class FachadaRegistro:
             termo_lower = termo_busca.lower().strip()
             pront_lower = REGEX_LIMPEZA_PRONTUARIO.sub("", termo_lower)
             candidatos = self.repo_estudante.ler_todos_com_grupos()
-            resultados_com_score = []
-            for est in candidatos:
-                score_nome = fuzz.partial_ratio(termo_lower, est.nome.lower())
-                score_pront = fuzz.ratio(
-                    pront_lower,
-                    REGEX_LIMPEZA_PRONTUARIO.sub("", est.prontuario.lower()),
-                )
-
-                final_score = max(score_nome, score_pront)
-
-                if final_score >= limite:
-                    resultados_com_score.append(
-                        {"estudante": est, "score": final_score}
-                    )
-
-            resultados_com_score.sort(key=lambda x: x["score"], reverse=True)
-            estudantes = [item["estudante"] for item in resultados_com_score]
+            nomes = [est.nome.lower() for est in candidatos]
+            pronts = [
+                REGEX_LIMPEZA_PRONTUARIO.sub("", est.prontuario.lower())
+                for est in candidatos
+            ]
+
+            # Cada critério é pontuado sobre todos os candidatos em uma única
+            # chamada nativa; vale o maior score de cada estudante.
+            scores: Dict[int, int] = {}
+            for termo, valores, scorer in (
+                (termo_lower, nomes, fuzz.partial_ratio),
+                (pront_lower, pronts, fuzz.ratio),
+            ):
+                for _, score, indice in process.extract(
+                    termo, valores, scorer=scorer, score_cutoff=limite, limit=None
+                ):
+                    scores[indice] = max(scores.get(indice, 0), round(score))
+
+            ordenados = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+            estudantes = [candidatos[indice] for indice, _ in ordenados]
 
         return [
             {
@@ -380,8 +394,12 @@ class FachadaRegistro:
         self,
         consumido: Optional[bool] = None,
         pular_grupos: bool = False,
+        ordenar_por_consumo: bool = False,
     ) -> List[Dict[str, Any]]:
-        """Retorna estudantes para a sessão ativa, com opção de filtro por consumo."""
+        """
+        Retorna estudantes para a sessão ativa, com opção de filtro por consumo.
+        Com `ordenar_por_consumo`, os consumos mais recentes vêm primeiro.
+        """
         if self.id_sessao_ativa is None:
             raise ErroSessaoNaoAtiva("Nenhuma sessão ativa definida.")
         return service_logic.obter_estudantes_para_sessao(
@@ -394,6 +412,25 @@ class FachadaRegistro:
             consumido=consumido,
             excessao_grupos=self.excessao_grupos,
             pular_grupos=pular_grupos,
+            ordenar_por_consumo=ordenar_por_consumo,
+        )
+
+    def contar_estudantes_para_sessao(
+        self,
+        consumido: Optional[bool] = None,
+        pular_grupos: bool = False,
+    ) -> int:
+        """Conta os estudantes da sessão ativa, com opção de filtro por consumo."""
+        if self.id_sessao_ativa is None:
+            raise ErroSessaoNaoAtiva("Nenhuma sessão ativa definida.")
+        return service_logic.contar_estudantes_para_sessao(
+            repo_sessao=self.repo_sessao,
+            repo_estudante=self.repo_estudante,
+            repo_grupo=self.repo_grupo,
+            id_sessao=self.id_sessao_ativa,
+            consumido=consumido,
+            excessao_grupos=self.excessao_grupos,
+            pular_grupos=pular_grupos,
         )
 
     def atualizar_grupos_sessao(
@@ -4,8 +4,9 @@
 Fornece implementações concretas do Padrão de Repositório, especializando
 a classe CRUD genérica para cada modelo de dados da aplicação.
 """
-from typing import List, Set, Optional
+from typing import List, Optional, Sequence, Set
 
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session, selectinload
 
 from registro.nucleo.crud import CRUD
@@ -49,6 +50,71 @@ class RepositorioEstudante(CRUD[Estudante]):
             .all()
         )
 
+    def contar_autorizados_na_sessao(
+        self,
+        id_sessao: int,
+        data: str,
+        ids_grupos_sessao: Set[int],
+        ids_grupos_excecao: Set[int],
+        por_reserva: bool,
+        pular_grupos: bool = False,
+        consumido: Optional[bool] = None,
+    ) -> int:
+        """
+        Conta, em uma única consulta, os estudantes autorizados na sessão, com as
+        mesmas regras de `service_logic.obter_estudantes_para_sessao`.
+        `por_reserva` indica refeições em que a reserva do dia autoriza o acesso
+        (almoço); nas demais, vale apenas pertencer a um grupo da sessão.
+        """
+        estudante_grupo = associacao_estudante_grupo
+
+        def em_grupos(ids_grupos: Set[int]):
+            return (
+                select(estudante_grupo.c.estudante_id)
+                .where(
+                    estudante_grupo.c.estudante_id == Estudante.id,
+                    estudante_grupo.c.grupo_id.in_(ids_grupos),
+                )
+                .exists()
+            )
+
+        em_grupo_sessao = em_grupos(ids_grupos_sessao)
+        em_grupo_excecao = em_grupos(ids_grupos_excecao)
+        tem_reserva = (
+            select(Reserva.id)
+            .where(
+                Reserva.estudante_id == Estudante.id,
+                Reserva.data == data,
+                Reserva.cancelada.is_(False),
+            )
+            .exists()
+        )
+        consumiu = (
+            select(Consumo.id)
+            .where(Consumo.estudante_id == Estudante.id, Consumo.sessao_id == id_sessao)
+            .exists()
+        )
+
+        if consumido is True:
+            condicoes = [consumiu]
+        else:
+            condicoes = [
+                Estudante.ativo.is_(True),
+                or_(em_grupo_sessao, em_grupo_excecao, tem_reserva),
+            ]
+            if consumido is False:
+                condicoes.append(~consumiu)
+
+        if not por_reserva:
+            condicoes.append(em_grupo_sessao)
+        elif not pular_grupos:
+            condicoes.append(
+                or_(and_(tem_reserva, em_grupo_sessao), em_grupo_excecao)
+            )
+
+        consulta = select(func.count()).select_from(Estudante).where(*condicoes)
+        return self._sessao_db.scalar(consulta) or 0
+
     def por_prontuarios_com_grupos(self, prontuarios: Set[str]) -> List[Estudante]:
         """Busca estudantes por prontuário, carregando seus grupos de forma otimizada."""
         if not prontuarios:
@@ -92,6 +158,23 @@ class RepositorioSessao(CRUD[Sessao]):
     def __init__(self, sessao: Session):
         super().__init__(sessao, Sessao)
 
+    def ler_ordenado_por_data(self) -> Sequence[Sessao]:
+        """
+        Lê as sessões da mais recente para a mais antiga. Como a data é
+        armazenada como 'DD/MM/YYYY', a ordenação usa ano, mês e dia.
+        """
+        consulta = (
+            select(Sessao)
+            .options(selectinload(Sessao.grupos))
+            .order_by(
+                func.substr(Sessao.data, 7, 4).desc(),
+                func.substr(Sessao.data, 4, 2).desc(),
+                func.substr(Sessao.data, 1, 2).desc(),
+                Sessao.hora.desc(),
+            )
+        )
+        return self._sessao_db.scalars(consulta).all()
+
 
 class RepositorioConsumo(CRUD[Consumo]):
     """Repositório para operações CRUD com o modelo Consumo."""
@@ -99,6 +182,15 @@ class RepositorioConsumo(CRUD[Consumo]):
     def __init__(self, sessao: Session):
         super().__init__(sessao, Consumo)
 
+    def ler_da_sessao_ordenado_por_hora(self, id_sessao: int) -> Sequence[Consumo]:
+        """Lê os consumos de uma sessão, do mais recente para o mais antigo."""
+        consulta = (
+            select(Consumo)
+            .where(Consumo.sessao_id == id_sessao)
+            .order_by(Consumo.hora_consumo.desc(), Consumo.id.desc())
+        )
+        return self._sessao_db.scalars(consulta).all()
+
     def por_prontuario_e_sessao(
         self, prontuario: str, id_sessao: int
     ) -> Consumo | None:
@@ -7,7 +7,7 @@ da aplicação de registro de refeições.
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import xlsxwriter
 from sqlalchemy import select, union
@@ -16,6 +16,7 @@ from sqlalchemy.orm import selectinload
 from registro.nucleo import google_api_service, importers_service, models
 from registro.nucleo.exceptions import (
     ErroAPIGoogle,
+    ErroEstudanteJaConsumiu,
     ErroImportacaoDados,
     ErroNucleoRegistro,
     ErroSessao,
@@ -72,8 +73,11 @@ def iniciar_nova_sessao(
 
 
 def listar_todas_sessoes(repo_sessao: RepositorioSessao) -> List[Dict[str, Any]]:
-    """Retorna uma lista simplificada de todas as sessões existentes."""
-    sessoes = repo_sessao.ler_todos()
+    """
+    Retorna uma lista simplificada das sessões existentes, da mais recente
+    para a mais antiga.
+    """
+    sessoes = repo_sessao.ler_ordenado_por_data()
     return [
         {
             "id": s.id,
@@ -108,7 +112,7 @@ def obter_detalhes_sessao(
     return sessao
 
 
-def obter_estudantes_para_sessao(
+def _iterar_estudantes_da_sessao(
     repo_sessao: RepositorioSessao,
     repo_estudante: RepositorioEstudante,
     repo_reserva: RepositorioReserva,
@@ -118,9 +122,12 @@ def obter_estudantes_para_sessao(
     consumido: Optional[bool] = None,
     excessao_grupos: Optional[Set[str]] = None,
     pular_grupos: bool = False,
-) -> List[Dict[str, Any]]:
+    ordenar_por_consumo: bool = False,
+) -> Iterator[Tuple[Estudante, str, str, Optional[Consumo]]]:
     """
-    Busca estudantes elegíveis para a sessão.
+    Percorre os estudantes autorizados na sessão que atendem ao filtro de
+    consumo, gerando (estudante, prato, motivo, consumo). A ordem com
+    `ordenar_por_consumo` é a de `obter_estudantes_para_sessao`.
     """
     sessao = obter_detalhes_sessao(repo_sessao, id_sessao)
     db_session = repo_estudante.obter_sessao()
@@ -171,7 +178,7 @@ def obter_estudantes_para_sessao(
     ids_para_buscar = set(db_session.execute(stmt).scalars().all())
 
     if not ids_para_buscar:
-        return []
+        return
 
     # --- PASSO 2: Carregar os objetos completos apenas para os estudantes elegíveis. ---
     # O 'selectinload' carrega os grupos de forma eficiente (1 consulta extra, não N).
@@ -181,16 +188,21 @@ def obter_estudantes_para_sessao(
     )
 
     # Carrega os outros dados necessários de uma só vez
-    mapa_consumos_por_estudante = {
-        c.estudante_id: c for c in repo_consumo.ler_filtrado(sessao_id=id_sessao)
-    }
+    consumos_sessao = repo_consumo.ler_da_sessao_ordenado_por_hora(id_sessao)
+    mapa_consumos_por_estudante = {c.estudante_id: c for c in consumos_sessao}
     mapa_reservas_dia = {
         r.estudante_id: r
         for r in repo_reserva.ler_filtrado(data=sessao.data, cancelada=False)
     }
 
+    if ordenar_por_consumo:
+        # A ordem dos consumos já vem do banco; não é preciso ordenar em Python
+        por_id = {est.id: est for est in estudantes}
+        estudantes = [
+            por_id[c.estudante_id] for c in consumos_sessao if c.estudante_id in por_id
+        ] + [est for est in estudantes if est.id not in mapa_consumos_por_estudante]
+
     # --- PASSO 3: Rodar a lógica original em Python sobre o conjunto de dados reduzido. ---
-    detalhes_estudantes = []
     for est in estudantes:
         autorizado = False
         motivo = "Acesso Negado"
@@ -224,6 +236,38 @@ def obter_estudantes_para_sessao(
         if consumido is False and info_consumo:
             continue
 
+        yield est, prato, motivo, info_consumo
+
+
+def obter_estudantes_para_sessao(
+    repo_sessao: RepositorioSessao,
+    repo_estudante: RepositorioEstudante,
+    repo_reserva: RepositorioReserva,
+    repo_consumo: RepositorioConsumo,
+    repo_grupo: RepositorioGrupo,
+    id_sessao: int,
+    consumido: Optional[bool] = None,
+    excessao_grupos: Optional[Set[str]] = None,
+    pular_grupos: bool = False,
+    ordenar_por_consumo: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Busca estudantes elegíveis para a sessão. Com `ordenar_por_consumo`, os que
+    já consumiram vêm primeiro, do consumo mais recente para o mais antigo.
+    """
+    detalhes_estudantes = []
+    for est, prato, motivo, info_consumo in _iterar_estudantes_da_sessao(
+        repo_sessao,
+        repo_estudante,
+        repo_reserva,
+        repo_consumo,
+        repo_grupo,
+        id_sessao,
+        consumido,
+        excessao_grupos,
+        pular_grupos,
+        ordenar_por_consumo,
+    ):
         grupos = ", ".join(sorted(g.nome for g in est.grupos)) if est.grupos else "N/A"
 
         detalhes_estudantes.append(
@@ -243,6 +287,31 @@ def obter_estudantes_para_sessao(
     return detalhes_estudantes
 
 
+def contar_estudantes_para_sessao(
+    repo_sessao: RepositorioSessao,
+    repo_estudante: RepositorioEstudante,
+    repo_grupo: RepositorioGrupo,
+    id_sessao: int,
+    consumido: Optional[bool] = None,
+    excessao_grupos: Optional[Set[str]] = None,
+    pular_grupos: bool = False,
+) -> int:
+    """
+    Conta os estudantes elegíveis para a sessão com um COUNT no banco, sem
+    carregar os estudantes.
+    """
+    sessao = obter_detalhes_sessao(repo_sessao, id_sessao)
+    return repo_estudante.contar_autorizados_na_sessao(
+        id_sessao,
+        sessao.data,
+        {g.id for g in sessao.grupos},
+        {g.id for g in repo_grupo.por_nomes(excessao_grupos or set())},
+        por_reserva=sessao.refeicao == "almoço",
+        pular_grupos=pular_grupos,
+        consumido=consumido,
+    )
+
+
 def deletar_sessao(repo_sessao: RepositorioSessao, id_sessao: int):
     """Deleta uma sessão e seus consumos associados (via cascade do DB)."""
     if not repo_sessao.deletar(id_sessao):
@@ -283,7 +352,9 @@ def registrar_consumo(
         estudante_id=estudante.id, sessao_id=id_sessao
     )
     if consumo_existente:
-        return {"autorizado": False, "motivo": "Consumo já registrado."}
+        raise ErroEstudanteJaConsumiu(
+            f"Estudante {prontuario} já consumiu nesta sessão."
+        )
 
     id_reserva = None
     autorizado = False
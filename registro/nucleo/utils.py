@@ -13,7 +13,7 @@ import sys
 from pathlib import Path
 from typing import Callable, Dict, List, Literal, Optional, Tuple, TypedDict
 
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz
 
 # --- Tipos de Dados ---
 
@@ -106,7 +106,7 @@ def salvar_csv(dados: list, caminho_arquivo: Path) -> bool:
 def encontrar_melhor_par_correspondente(
     par_alvo: Tuple[str, str],
     vetor_de_pares: List[Tuple[str, str]],
-    funcao_pontuacao: Callable[[str, str], int] = fuzz.ratio,
+    funcao_pontuacao: Callable[[str, str], float] = fuzz.ratio,
 ) -> Tuple[Optional[Tuple[str, str]], int]:
     """Encontra o par de strings com melhor correspondência em um vetor,
     ponderando o segundo item."""
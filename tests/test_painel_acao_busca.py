@@ -0,0 +1,151 @@
+# ----------------------------------------------------------------------------
+# Arquivo: tests/test_painel_acao_busca.py
+# ----------------------------------------------------------------------------
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2024-2025 Mateus G Pereira <mateus.pereira@ifsp.edu.br>
+
+from collections import OrderedDict
+
+import pytest
+
+from registro.gui.painel_acao_busca import EstudanteElegivel, PainelAcaoBusca
+
+
+def _estudante(pront: str, nome: str) -> EstudanteElegivel:
+    return EstudanteElegivel(
+        pront=pront,
+        nome=nome,
+        turma="1A",
+        prato=None,
+        nome_lower=nome.lower(),
+        pront_limpo=pront.lower(),
+        linha=(nome, pront, "1A", "Sem Reserva"),
+    )
+
+
+class _VarFalsa:
+    def __init__(self, valor: str = ""):
+        self.valor = valor
+
+    def get(self) -> str:
+        return self.valor
+
+    def set(self, valor: str):
+        self.valor = valor
+
+
+class _ViewFalsa:
+    """Seleção sem disparar <<TreeviewSelect>> (o evento fica 'na fila')."""
+
+    def __init__(self):
+        self.selecao = ()
+
+    def focus(self, _iid):
+        pass
+
+    def selection_set(self, iid):
+        self.selecao = (iid,)
+
+    def see(self, _iid):
+        pass
+
+
+class _TabelaFalsa:
+    def __init__(self):
+        self.view = _ViewFalsa()
+        self.iids = ()
+
+    def sincronizar_linhas(self, _anteriores, novas) -> bool:
+        self.iids = tuple(novas)
+        return True
+
+    def obter_iids_filhos(self):
+        return self.iids
+
+    def obter_iid_selecionado(self):
+        return self.view.selecao[0] if self.view.selecao else None
+
+    def deletar_linhas(self, iids=None):
+        self.iids = ()
+        self.view.selecao = ()
+
+
+class _FachadaFalsa:
+    def __init__(self):
+        self.registrados = []
+
+    def registrar_consumo(self, pront, pular_grupos=False):
+        self.registrados.append(pront)
+        return {"prontuario": pront}
+
+
+class _AppFalso:
+    def notificar_sucesso_registro(self, _tupla):
+        pass
+
+
+@pytest.fixture
+def painel() -> PainelAcaoBusca:
+    """Painel sem Tk, só com o estado usado pela busca e o registro."""
+    painel = PainelAcaoBusca.__new__(PainelAcaoBusca)
+    painel._app = _AppFalso()
+    painel._fachada = _FachadaFalsa()
+    painel._var_entrada_busca = _VarFalsa()
+    painel._entrada_busca = None
+    painel._botao_limpar = None
+    painel._botao_registrar = None
+    painel._label_aluno_selecionado = None
+    painel._tree_estudantes_elegiveis = _TabelaFalsa()
+    painel._estados_ui = {}
+    painel._preview_aplicado = None
+    painel._id_after_busca = None
+    painel._dados_correspondencias_elegiveis_atuais = []
+    painel._mapa_iid_para_estudante = {}
+    painel._linhas_elegiveis_exibidas = {}
+    painel._dados_elegivel_selecionado = None
+    painel._seq_busca = 0
+    painel._busca_pendente = None
+    painel._resultados_busca = OrderedDict()
+    painel._resultados_busca_de = None
+    painel._busca_em_andamento = False
+    painel._registrar_apos_busca = False
+    painel.after = lambda _atraso, funcao, *args: "after#1"
+    painel.after_cancel = lambda _id: None
+    return painel
+
+
+def _buscar(pronts, termo):
+    estudantes = [_estudante(p, f"Aluno {p}") for p in pronts]
+    elegiveis = PainelAcaoBusca._indexar_elegiveis(estudantes, None)
+    return [e.pront for e in PainelAcaoBusca._executar_busca_fuzzy(termo, elegiveis)]
+
+
+def test_enter_em_termo_em_cache_registra_o_resultado_do_termo_atual(painel):
+    ana, bruno = _estudante("SP0001", "Ana"), _estudante("SP0002", "Bruno")
+    painel._var_entrada_busca.set("bruno")
+    elegiveis = painel._indexar_elegiveis([ana, bruno], None)
+    painel._obter_elegiveis = lambda _pular_grupos: elegiveis
+
+    # Resultados de "ana" exibidos e selecionados; "bruno" já está em cache
+    painel._resultados_busca_de = elegiveis
+    painel._resultados_busca["bruno"] = [bruno]
+    painel._aplicar_resultados_busca(painel._seq_busca, [ana])
+    painel._ao_selecionar_estudante_elegivel()
+    assert painel._dados_elegivel_selecionado is ana
+
+    # "bruno" digitado, debounce ainda pendente quando o Enter chega
+    painel._id_after_busca = "after#1"
+    painel._ao_confirmar_busca()
+
+    assert painel._fachada.registrados == ["SP0002"]
+
+
+def test_prefiltro_de_bigramas_mantem_correspondencia_sem_trigrama_comum():
+    # partial_ratio("4192", "41224") ~ 85.7, sem nenhum trigrama em comum
+    assert "41224" in _buscar(["41224", "77777", "88888"], "4192")
+
+
+def test_prefiltro_sem_candidatos_pontua_todos_os_prontuarios():
+    # "7" não tem bigramas, então o filtro não devolve candidatos; ainda assim
+    # partial_ratio("77", "7") == 100 e só a pontuação completa o encontra.
+    assert _buscar(["7", "12345"], "77") == ["7"]